@@ -20,19 +20,23 @@ import numpy
 from matplotlib import pyplot as plt
 from neuroml import Cell, NeuroMLDocument, Segment, SegmentGroup
 from neuroml.neuro_lex_ids import neuro_lex_ids
-from pyneuroml.pynml import read_neuroml2_file
 from pyneuroml.utils import extract_position_info
 from pyneuroml.utils.cli import build_namespace
 from pyneuroml.utils.plot import (
     DEFAULTS,
+    PLANE_TO_COLUMN_INDICES,
     add_box_to_matplotlib_2D_plot,
-    add_line_to_matplotlib_2D_plot,
+    add_lines_to_matplotlib_2D_plot,
     add_scalebar_to_matplotlib_plot,
     add_text_to_matplotlib_2D_plot,
     autoscale_matplotlib_plot,
+    classify_segments,
+    get_actual_proximals,
+    get_cell_segments_array,
+    get_segment_group_sets,
     get_new_matplotlib_morph_plot,
     get_next_hex_color,
-    load_minimal_morphplottable__model,
+    load_plottable_nml_model,
 )
 
 logger = logging.getLogger(__name__)
@@ -246,141 +250,122 @@ def plot_2D(
             "plot_type must be one of 'detailed', 'constant', 'schematic', 'point'"
         )
 
-    if verbose:
-        print("Plotting %s" % nml_file)
+    prior_backend = None
+    if nogui and save_to_file:
+        # batch rendering to file only: use the Agg canvas and skip GUI
+        # backend/event loop setup; the previous backend is restored
+        # afterwards so later interactive plots in this process are
+        # unaffected
+        prior_backend = matplotlib.get_backend()
+        matplotlib.use("Agg", force=False)
 
-    if type(nml_file) is str:
-        # load without optimization for older HDF5 API
-        # TODO: check if this is required: must for MultiscaleISN
-        if nml_file.endswith(".h5"):
-            nml_model = read_neuroml2_file(nml_file)
+    try:
+        if verbose:
+            print("Plotting %s" % nml_file)
+
+        if type(nml_file) is str:
+            nml_model = load_plottable_nml_model(nml_file)
+
+            if title is None:
+                try:
+                    title = f"{nml_model.networks[0].id} from {nml_file}"
+                except IndexError:
+                    title = f"{nml_model.cells[0].id} from {nml_file}"
+
+        elif isinstance(nml_file, Cell):
+            nml_model = NeuroMLDocument(id="newdoc")
+            nml_model.add(nml_file)
+            if title is None:
+                title = f"{nml_model.cells[0].id}"
+
+        elif isinstance(nml_file, NeuroMLDocument):
+            nml_model = nml_file
+            if title is None:
+                try:
+                    title = f"{nml_model.networks[0].id} from {nml_file.id}"
+                except IndexError:
+                    title = f"{nml_model.cells[0].id} from {nml_file.id}"
         else:
-            nml_model = read_neuroml2_file(
-                nml_file,
-                include_includes=False,
-                check_validity_pre_include=False,
-                verbose=False,
-                optimized=True,
+            raise TypeError(
+                "Passed model is not a NeuroML file path, nor a neuroml.Cell, nor a neuroml.NeuroMLDocument"
             )
-            load_minimal_morphplottable__model(nml_model, nml_file)
-
-        if title is None:
-            try:
-                title = f"{nml_model.networks[0].id} from {nml_file}"
-            except IndexError:
-                title = f"{nml_model.cells[0].id} from {nml_file}"
-
-    elif isinstance(nml_file, Cell):
-        nml_model = NeuroMLDocument(id="newdoc")
-        nml_model.add(nml_file)
-        if title is None:
-            title = f"{nml_model.cells[0].id}"
-
-    elif isinstance(nml_file, NeuroMLDocument):
-        nml_model = nml_file
-        if title is None:
-            try:
-                title = f"{nml_model.networks[0].id} from {nml_file.id}"
-            except IndexError:
-                title = f"{nml_model.cells[0].id} from {nml_file.id}"
-    else:
-        raise TypeError(
-            "Passed model is not a NeuroML file path, nor a neuroml.Cell, nor a neuroml.NeuroMLDocument"
-        )
 
-    (
-        cell_id_vs_cell,
-        pop_id_vs_cell,
-        positions,
-        pop_id_vs_color,
-        pop_id_vs_radii,
-    ) = extract_position_info(nml_model, verbose)
+        (
+            cell_id_vs_cell,
+            pop_id_vs_cell,
+            positions,
+            pop_id_vs_color,
+            pop_id_vs_radii,
+        ) = extract_position_info(nml_model, verbose)
 
-    if verbose:
-        logger.debug(f"positions: {positions}")
-        logger.debug(f"pop_id_vs_cell: {pop_id_vs_cell}")
-        logger.debug(f"cell_id_vs_cell: {cell_id_vs_cell}")
-        logger.debug(f"pop_id_vs_color: {pop_id_vs_color}")
-        logger.debug(f"pop_id_vs_radii: {pop_id_vs_radii}")
-
-    # not used, clear up
-    del cell_id_vs_cell
+        if verbose:
+            logger.debug(f"positions: {positions}")
+            logger.debug(f"pop_id_vs_cell: {pop_id_vs_cell}")
+            logger.debug(f"cell_id_vs_cell: {cell_id_vs_cell}")
+            logger.debug(f"pop_id_vs_color: {pop_id_vs_color}")
+            logger.debug(f"pop_id_vs_radii: {pop_id_vs_radii}")
 
-    fig, ax = get_new_matplotlib_morph_plot(title, plane2d)
-    axis_min_max = [float("inf"), -1 * float("inf")]
+        # not used, clear up
+        del cell_id_vs_cell
 
-    # process plot_spec
-    point_cells = []  # type: typing.List[int]
-    schematic_cells = []  # type: typing.List[int]
-    constant_cells = []  # type: typing.List[int]
-    detailed_cells = []  # type: typing.List[int]
-    if plot_spec is not None:
-        try:
-            point_cells = plot_spec["point_cells"]
-        except KeyError:
-            pass
-        try:
-            schematic_cells = plot_spec["schematic_cells"]
-        except KeyError:
-            pass
-        try:
-            constant_cells = plot_spec["constant_cells"]
-        except KeyError:
-            pass
-        try:
-            detailed_cells = plot_spec["detailed_cells"]
-        except KeyError:
-            pass
-
-    while pop_id_vs_cell:
-        pop_id, cell = pop_id_vs_cell.popitem()
-        pos_pop = positions[pop_id]  # type: typing.Dict[typing.Any, typing.List[float]]
-
-        # reinit point_cells for each loop
-        point_cells_pop = []
-        if len(point_cells) == 0 and plot_spec is not None:
-            cell_indices = list(pos_pop.keys())
+        fig, ax = get_new_matplotlib_morph_plot(title, plane2d)
+        axis_min_max = [float("inf"), -1 * float("inf")]
+
+        # process plot_spec
+        point_cells = []  # type: typing.List[int]
+        schematic_cells = []  # type: typing.List[int]
+        constant_cells = []  # type: typing.List[int]
+        detailed_cells = []  # type: typing.List[int]
+        if plot_spec is not None:
             try:
-                point_cells_pop = random.sample(
-                    cell_indices,
-                    int(len(cell_indices) * float(plot_spec["point_fraction"])),
-                )
+                point_cells = plot_spec["point_cells"]
             except KeyError:
                 pass
+            try:
+                schematic_cells = plot_spec["schematic_cells"]
+            except KeyError:
+                pass
+            try:
+                constant_cells = plot_spec["constant_cells"]
+            except KeyError:
+                pass
+            try:
+                detailed_cells = plot_spec["detailed_cells"]
+            except KeyError:
+                pass
+
+        while pop_id_vs_cell:
+            pop_id, cell = pop_id_vs_cell.popitem()
+            pos_pop = positions[pop_id]  # type: typing.Dict[typing.Any, typing.List[float]]
 
-        while pos_pop:
-            cell_index, pos = pos_pop.popitem()
+            # these only depend on the population, not on the cell instance
             radius = pop_id_vs_radii[pop_id] if pop_id in pop_id_vs_radii else 10
             color = pop_id_vs_color[pop_id] if pop_id in pop_id_vs_color else None
 
-            if cell is None:
-                plot_2D_point_cells(
-                    offset=pos,
-                    plane2d=plane2d,
-                    color=color,
-                    soma_radius=radius,
-                    verbose=verbose,
-                    ax=ax,
-                    fig=fig,
-                    autoscale=False,
-                    scalebar=False,
-                    nogui=True,
-                )
-            else:
-                if (
-                    plot_type == "point"
-                    or cell_index in point_cells_pop
-                    or cell.id in point_cells
-                ):
-                    # assume that soma is 0, plot point at where soma should be
-                    soma_x_y_z = cell.get_actual_proximal(0)
-                    pos1 = [
-                        pos[0] + soma_x_y_z.x,
-                        pos[1] + soma_x_y_z.y,
-                        pos[2] + soma_x_y_z.z,
-                    ]
+            if cell is not None:
+                # warm the per-cell caches once per population, so that plotting
+                # each cell instance below only does cheap array work
+                get_cell_segments_array(cell)
+                get_segment_group_sets(cell)
+
+            # reinit point_cells for each loop
+            point_cells_pop = []
+            if len(point_cells) == 0 and plot_spec is not None:
+                cell_indices = list(pos_pop.keys())
+                try:
+                    point_cells_pop = random.sample(
+                        cell_indices,
+                        int(len(cell_indices) * float(plot_spec["point_fraction"])),
+                    )
+                except KeyError:
+                    pass
+
+            while pos_pop:
+                cell_index, pos = pos_pop.popitem()
+
+                if cell is None:
                     plot_2D_point_cells(
-                        offset=pos1,
+                        offset=pos,
                         plane2d=plane2d,
                         color=color,
                         soma_radius=radius,
@@ -391,57 +376,85 @@ def plot_2D(
                         scalebar=False,
                         nogui=True,
                     )
-                elif plot_type == "schematic" or cell.id in schematic_cells:
-                    plot_2D_schematic(
-                        offset=pos,
-                        cell=cell,
-                        segment_groups=None,
-                        labels=False,
-                        plane2d=plane2d,
-                        verbose=verbose,
-                        fig=fig,
-                        ax=ax,
-                        scalebar=False,
-                        nogui=True,
-                        autoscale=False,
-                        square=False,
-                    )
-                elif (
-                    plot_type == "detailed"
-                    or cell.id in detailed_cells
-                    or plot_type == "constant"
-                    or cell.id in constant_cells
-                ):
-                    plot_2D_cell_morphology(
-                        offset=pos,
-                        cell=cell,
-                        plane2d=plane2d,
-                        color=color,
-                        plot_type=plot_type,
-                        verbose=verbose,
-                        fig=fig,
-                        ax=ax,
-                        min_width=min_width,
-                        axis_min_max=axis_min_max,
-                        scalebar=False,
-                        nogui=True,
-                        autoscale=False,
-                        square=False,
-                    )
+                else:
+                    if (
+                        plot_type == "point"
+                        or cell_index in point_cells_pop
+                        or cell.id in point_cells
+                    ):
+                        # assume that soma is 0, plot point at where soma should be
+                        soma_x_y_z = get_actual_proximals(cell)[0]
+                        pos1 = [
+                            pos[0] + soma_x_y_z.x,
+                            pos[1] + soma_x_y_z.y,
+                            pos[2] + soma_x_y_z.z,
+                        ]
+                        plot_2D_point_cells(
+                            offset=pos1,
+                            plane2d=plane2d,
+                            color=color,
+                            soma_radius=radius,
+                            verbose=verbose,
+                            ax=ax,
+                            fig=fig,
+                            autoscale=False,
+                            scalebar=False,
+                            nogui=True,
+                        )
+                    elif plot_type == "schematic" or cell.id in schematic_cells:
+                        plot_2D_schematic(
+                            offset=pos,
+                            cell=cell,
+                            segment_groups=None,
+                            labels=False,
+                            plane2d=plane2d,
+                            verbose=verbose,
+                            fig=fig,
+                            ax=ax,
+                            scalebar=False,
+                            nogui=True,
+                            autoscale=False,
+                            square=False,
+                        )
+                    elif (
+                        plot_type == "detailed"
+                        or cell.id in detailed_cells
+                        or plot_type == "constant"
+                        or cell.id in constant_cells
+                    ):
+                        plot_2D_cell_morphology(
+                            offset=pos,
+                            cell=cell,
+                            plane2d=plane2d,
+                            color=color,
+                            plot_type=plot_type,
+                            verbose=verbose,
+                            fig=fig,
+                            ax=ax,
+                            min_width=min_width,
+                            axis_min_max=axis_min_max,
+                            scalebar=False,
+                            nogui=True,
+                            autoscale=False,
+                            square=False,
+                        )
 
-    add_scalebar_to_matplotlib_plot(axis_min_max, ax)
-    autoscale_matplotlib_plot(verbose, square)
+        add_scalebar_to_matplotlib_plot(axis_min_max, ax)
+        autoscale_matplotlib_plot(verbose, square)
 
-    if save_to_file:
-        abs_file = os.path.abspath(save_to_file)
-        plt.savefig(abs_file, dpi=200, bbox_inches="tight")
-        print(f"Saved image on plane {plane2d} to {abs_file} of plot: {title}")
+        if save_to_file:
+            abs_file = os.path.abspath(save_to_file)
+            plt.savefig(abs_file, dpi=200, bbox_inches="tight")
+            print(f"Saved image on plane {plane2d} to {abs_file} of plot: {title}")
 
-    if not nogui:
-        plt.show()
-    if close_plot:
-        logger.info("Closing plot")
-        plt.close()
+        if not nogui:
+            plt.show()
+        if close_plot:
+            logger.info("Closing plot")
+            plt.close()
+    finally:
+        if prior_backend is not None and prior_backend != matplotlib.get_backend():
+            matplotlib.use(prior_backend, force=False)
 
 
 def plot_2D_cell_morphology(
@@ -543,18 +556,7 @@ def plot_2D_cell_morphology(
             "No cell provided. If you would like to plot a network of point neurons, consider using `plot_2D_point_cells` instead"
         )
 
-    try:
-        soma_segs = cell.get_all_segments_in_group("soma_group")
-    except Exception:
-        soma_segs = []
-    try:
-        dend_segs = cell.get_all_segments_in_group("dendrite_group")
-    except Exception:
-        dend_segs = []
-    try:
-        axon_segs = cell.get_all_segments_in_group("axon_group")
-    except Exception:
-        axon_segs = []
+    soma_segs, dend_segs, axon_segs = get_segment_group_sets(cell)
 
     if fig is None:
         fig, ax = get_new_matplotlib_morph_plot(title)
@@ -593,108 +595,75 @@ def plot_2D_cell_morphology(
                 ax=ax,
             )
 
-    # random default color
-    for seg in cell.morphology.segments:
-        p = cell.get_actual_proximal(seg.id)
-        d = seg.distal
-        width = (p.diameter + d.diameter) / 2
+    # assemble the geometry of all segments as numpy arrays and add them to
+    # the axes in one go as a collection: adding one matplotlib artist per
+    # segment, and accessing the attributes of each segment object in Python,
+    # are both very slow for cells with many segments
+    seg_arr = get_cell_segments_array(cell)
+
+    try:
+        col_a, col_b = PLANE_TO_COLUMN_INDICES[plane2d]
+    except KeyError:
+        raise Exception(f"Invalid value for plane: {plane2d}")
 
-        if width < min_width:
-            width = min_width
+    segments = numpy.empty((len(seg_arr), 2, 2), dtype=numpy.float32)
+    segments[:, :, 0] = seg_arr[:, (col_a, col_a + 4)] + offset[col_a]
+    segments[:, :, 1] = seg_arr[:, (col_b, col_b + 4)] + offset[col_b]
 
-        if plot_type == "constant":
-            width = min_width
+    seg_widths, spherical_segs = classify_segments(seg_arr, min_width)
+    if plot_type == "constant":
+        seg_widths = numpy.full(len(seg_arr), min_width)
 
-        if overlay_data and acolormap and norm:
+    if color is not None:
+        seg_colors = [color] * len(seg_arr)  # type: typing.Any
+    elif overlay_data and acolormap and norm:
+        # overlaid data colors are looked up per segment id in the colormap
+        seg_colors = []
+        for seg in cell.morphology.segments:
             try:
-                seg_color = acolormap(norm(overlay_data[seg.id]))
+                seg_colors.append(acolormap(norm(overlay_data[seg.id])))
             except KeyError:
-                seg_color = "black"
-        else:
-            seg_color = "b"
-            if seg.id in soma_segs:
-                seg_color = "g"
-            elif seg.id in axon_segs:
-                seg_color = "r"
-
-        spherical = (
-            p.x == d.x and p.y == d.y and p.z == d.z and p.diameter == d.diameter
+                seg_colors.append("black")
+    else:
+        # colors only depend on segment group membership: index a small RGBA
+        # palette with masks instead of passing one color string per segment
+        seg_ids = numpy.fromiter(
+            (seg.id for seg in cell.morphology.segments),
+            dtype=numpy.int64,
+            count=len(seg_arr),
+        )
+        palette = matplotlib.colors.to_rgba_array(["b", "g", "r"]).astype(
+            numpy.float32
         )
+        color_idx = numpy.zeros(len(seg_arr), dtype=numpy.int8)
+        # soma last: it takes precedence if a segment is in both groups
+        color_idx[numpy.isin(seg_ids, list(axon_segs))] = 2
+        color_idx[numpy.isin(seg_ids, list(soma_segs))] = 1
+        seg_colors = palette[color_idx]
 
-        if verbose:
+    if verbose:
+        for seg, width, spherical, seg_color in zip(
+            cell.morphology.segments, seg_widths, spherical_segs, seg_colors
+        ):
             logger.info(
-                "\nSeg %s, id: %s%s has proximal: %s, distal: %s (width: %s, min_width: %s), color: %s"
+                "\nSeg %s, id: %s%s (width: %s, min_width: %s), color: %s"
                 % (
                     seg.name,
                     seg.id,
                     " (spherical)" if spherical else "",
-                    p,
-                    d,
                     width,
                     min_width,
                     str(seg_color),
                 )
             )
 
-        if plane2d == "xy":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[0] + p.x, offset[0] + d.x],
-                [offset[1] + p.y, offset[1] + d.y],
-                width,
-                seg_color if color is None else color,
-                axis_min_max,
-            )
-        elif plane2d == "yx":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[1] + p.y, offset[1] + d.y],
-                [offset[0] + p.x, offset[0] + d.x],
-                width,
-                seg_color if color is None else color,
-                axis_min_max,
-            )
-        elif plane2d == "xz":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[0] + p.x, offset[0] + d.x],
-                [offset[2] + p.z, offset[2] + d.z],
-                width,
-                seg_color if color is None else color,
-                axis_min_max,
-            )
-        elif plane2d == "zx":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[2] + p.z, offset[2] + d.z],
-                [offset[0] + p.x, offset[0] + d.x],
-                width,
-                seg_color if color is None else color,
-                axis_min_max,
-            )
-        elif plane2d == "yz":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[1] + p.y, offset[1] + d.y],
-                [offset[2] + p.z, offset[2] + d.z],
-                width,
-                seg_color if color is None else color,
-                axis_min_max,
-            )
-        elif plane2d == "zy":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[2] + p.z, offset[2] + d.z],
-                [offset[1] + p.y, offset[1] + d.y],
-                width,
-                seg_color if color is None else color,
-                axis_min_max,
-            )
-        else:
-            raise Exception(f"Invalid value for plane: {plane2d}")
+    if len(segments) > 0:
+        add_lines_to_matplotlib_2D_plot(
+            ax, segments, seg_widths, seg_colors, axis_min_max
+        )
 
-        if verbose:
-            print("Extent x: %s -> %s" % (axis_min_max[0], axis_min_max[1]))
+    if verbose:
+        print("Extent x: %s -> %s" % (axis_min_max[0], axis_min_max[1]))
 
     if scalebar:
         add_scalebar_to_matplotlib_plot(axis_min_max, ax)
@@ -781,62 +750,19 @@ def plot_2D_point_cells(
 
     cell_color = get_next_hex_color()
 
-    if plane2d == "xy":
-        add_line_to_matplotlib_2D_plot(
-            ax,
-            [offset[0], offset[0]],
-            [offset[1], offset[1]],
-            soma_radius,
-            cell_color if color is None else color,
-            axis_min_max,
-        )
-    elif plane2d == "yx":
-        add_line_to_matplotlib_2D_plot(
-            ax,
-            [offset[1], offset[1]],
-            [offset[0], offset[0]],
-            soma_radius,
-            cell_color if color is None else color,
-            axis_min_max,
-        )
-    elif plane2d == "xz":
-        add_line_to_matplotlib_2D_plot(
-            ax,
-            [offset[0], offset[0]],
-            [offset[2], offset[2]],
-            soma_radius,
-            cell_color if color is None else color,
-            axis_min_max,
-        )
-    elif plane2d == "zx":
-        add_line_to_matplotlib_2D_plot(
-            ax,
-            [offset[2], offset[2]],
-            [offset[0], offset[0]],
-            soma_radius,
-            cell_color if color is None else color,
-            axis_min_max,
-        )
-    elif plane2d == "yz":
-        add_line_to_matplotlib_2D_plot(
-            ax,
-            [offset[1], offset[1]],
-            [offset[2], offset[2]],
-            soma_radius,
-            cell_color if color is None else color,
-            axis_min_max,
-        )
-    elif plane2d == "zy":
-        add_line_to_matplotlib_2D_plot(
-            ax,
-            [offset[2], offset[2]],
-            [offset[1], offset[1]],
-            soma_radius,
-            cell_color if color is None else color,
-            axis_min_max,
-        )
-    else:
+    try:
+        col_a, col_b = PLANE_TO_COLUMN_INDICES[plane2d]
+    except KeyError:
         raise Exception(f"Invalid value for plane: {plane2d}")
+    point = (offset[col_a], offset[col_b])
+
+    add_lines_to_matplotlib_2D_plot(
+        ax,
+        [[point, point]],
+        [soma_radius],
+        [cell_color if color is None else color],
+        axis_min_max,
+    )
 
     if scalebar:
         add_scalebar_to_matplotlib_plot(axis_min_max, ax)
@@ -945,33 +871,23 @@ def plot_2D_schematic(
         logger.debug("No figure provided, creating new fig and ax")
         fig, ax = get_new_matplotlib_morph_plot(title, plane2d)
 
-    if plane2d == "xy":
-        ax.set_xlabel("x (μm)")
-        ax.set_ylabel("y (μm)")
-    elif plane2d == "yx":
-        ax.set_xlabel("y (μm)")
-        ax.set_ylabel("x (μm)")
-    elif plane2d == "xz":
-        ax.set_xlabel("x (μm)")
-        ax.set_ylabel("z (μm)")
-    elif plane2d == "zx":
-        ax.set_xlabel("z (μm)")
-        ax.set_ylabel("x (μm)")
-    elif plane2d == "yz":
-        ax.set_xlabel("y (μm)")
-        ax.set_ylabel("z (μm)")
-    elif plane2d == "zy":
-        ax.set_xlabel("z (μm)")
-        ax.set_ylabel("y (μm)")
-    else:
+    if plane2d not in PLANE_TO_COLUMN_INDICES:
         logger.error(f"Invalid value for plane: {plane2d}")
         sys.exit(-1)
 
+    ax.set_xlabel(f"{plane2d[0]} (μm)")
+    ax.set_ylabel(f"{plane2d[1]} (μm)")
+
+    # names of the coordinate attributes to plot on each axis
+    attr_a, attr_b = plane2d[0], plane2d[1]
+
     # use a mutable object so it can be passed as an argument to methods, using
     # float (immuatable) variables requires us to return these from all methods
     axis_min_max = [float("inf"), -1 * float("inf")]
     width = 1
 
+    segments = []
+    colors = []
     for sgid, segs in ord_segs.items():
         sgobj = cell.get_segment_group(sgid)
         if sgobj.neuro_lex_id != neuro_lex_ids["section"]:
@@ -986,114 +902,27 @@ def plot_2D_schematic(
         # unique color for each segment group
         color = get_next_hex_color()
 
-        if plane2d == "xy":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[0] + first_seg.proximal.x, offset[0] + last_seg.distal.x],
-                [offset[1] + first_seg.proximal.y, offset[1] + last_seg.distal.y],
-                width,
-                color,
-                axis_min_max,
-            )
-            if labels:
-                add_text_to_matplotlib_2D_plot(
-                    ax,
-                    [offset[0] + first_seg.proximal.x, offset[0] + last_seg.distal.x],
-                    [offset[1] + first_seg.proximal.y, offset[1] + last_seg.distal.y],
-                    color=color,
-                    text=sgid,
-                )
+        xv = [
+            offset[0] + getattr(first_seg.proximal, attr_a),
+            offset[0] + getattr(last_seg.distal, attr_a),
+        ]
+        yv = [
+            offset[1] + getattr(first_seg.proximal, attr_b),
+            offset[1] + getattr(last_seg.distal, attr_b),
+        ]
+
+        segments.append([(xv[0], yv[0]), (xv[1], yv[1])])
+        colors.append(color)
+        if labels:
+            add_text_to_matplotlib_2D_plot(ax, xv, yv, color=color, text=sgid)
 
-        elif plane2d == "yx":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[0] + first_seg.proximal.y, offset[0] + last_seg.distal.y],
-                [offset[1] + first_seg.proximal.x, offset[1] + last_seg.distal.x],
-                width,
-                color,
-                axis_min_max,
-            )
-            if labels:
-                add_text_to_matplotlib_2D_plot(
-                    ax,
-                    [offset[0] + first_seg.proximal.y, offset[0] + last_seg.distal.y],
-                    [offset[1] + first_seg.proximal.x, offset[1] + last_seg.distal.x],
-                    color=color,
-                    text=sgid,
-                )
-        elif plane2d == "xz":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[0] + first_seg.proximal.x, offset[0] + last_seg.distal.x],
-                [offset[1] + first_seg.proximal.z, offset[1] + last_seg.distal.z],
-                width,
-                color,
-                axis_min_max,
-            )
-            if labels:
-                add_text_to_matplotlib_2D_plot(
-                    ax,
-                    [offset[0] + first_seg.proximal.x, offset[0] + last_seg.distal.x],
-                    [offset[1] + first_seg.proximal.z, offset[1] + last_seg.distal.z],
-                    color=color,
-                    text=sgid,
-                )
-        elif plane2d == "zx":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[0] + first_seg.proximal.z, offset[0] + last_seg.distal.z],
-                [offset[1] + first_seg.proximal.x, offset[1] + last_seg.distal.x],
-                width,
-                color,
-                axis_min_max,
-            )
-            if labels:
-                add_text_to_matplotlib_2D_plot(
-                    ax,
-                    [offset[0] + first_seg.proximal.z, offset[0] + last_seg.distal.z],
-                    [offset[1] + first_seg.proximal.x, offset[1] + last_seg.distal.x],
-                    color=color,
-                    text=sgid,
-                )
-        elif plane2d == "yz":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[0] + first_seg.proximal.y, offset[0] + last_seg.distal.y],
-                [offset[1] + first_seg.proximal.z, offset[1] + last_seg.distal.z],
-                width,
-                color,
-                axis_min_max,
-            )
-            if labels:
-                add_text_to_matplotlib_2D_plot(
-                    ax,
-                    [offset[0] + first_seg.proximal.y, offset[0] + last_seg.distal.y],
-                    [offset[1] + first_seg.proximal.z, offset[1] + last_seg.distal.z],
-                    color=color,
-                    text=sgid,
-                )
-        elif plane2d == "zy":
-            add_line_to_matplotlib_2D_plot(
-                ax,
-                [offset[0] + first_seg.proximal.z, offset[0] + last_seg.distal.z],
-                [offset[1] + first_seg.proximal.y, offset[1] + last_seg.distal.y],
-                width,
-                color,
-                axis_min_max,
-            )
-            if labels:
-                add_text_to_matplotlib_2D_plot(
-                    ax,
-                    [offset[0] + first_seg.proximal.z, offset[0] + last_seg.distal.z],
-                    [offset[1] + first_seg.proximal.y, offset[1] + last_seg.distal.y],
-                    color=color,
-                    text=sgid,
-                )
-        else:
-            raise Exception(f"Invalid value for plane: {plane2d}")
+    if len(segments) > 0:
+        add_lines_to_matplotlib_2D_plot(
+            ax, segments, [width] * len(segments), colors, axis_min_max
+        )
 
-        if verbose:
-            print("Extent x: %s -> %s" % (axis_min_max[0], axis_min_max[1]))
+    if verbose:
+        print("Extent x: %s -> %s" % (axis_min_max[0], axis_min_max[1]))
 
     if scalebar:
         add_scalebar_to_matplotlib_plot(axis_min_max, ax)
@@ -10,15 +10,171 @@ Copyright 2023 NeuroML contributors
 """
 
 import os
+import sys
+import threading
 import typing
 import logging
+import numpy
 import plotly.graph_objects as go
+import plotly.io
 from neuroml import Cell, NeuroMLDocument
-from pyneuroml.pynml import read_neuroml2_file
+from pyneuroml.utils.plot import (
+    decimate_collinear_segments,
+    get_actual_proximals,
+    get_cell_segments_array,
+    get_frustrum_surfaces,
+    get_sphere_surface,
+    load_plottable_nml_model,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# serializing the figure to JSON (for export, write_json, show) dominates
+# for large morphologies; orjson is several times faster than the stdlib
+# encoder and serializes the numpy coordinate arrays without a tolist()
+# round-trip
+try:
+    import orjson  # noqa: F401
+
+    plotly.io.json.config.default_engine = "orjson"
+except ImportError:
+    pass
+
+# plotly only supports a single line width per Scatter3d trace, so line plots
+# quantize segment widths into at most this many buckets (traces)
+MAX_LINE_WIDTH_BUCKETS = 4
+
+# style shared by the three scene axes; plotly copies layout dicts on
+# ingest, so aliasing one dict is safe
+_AXIS_STYLE = dict(
+    backgroundcolor="white",
+    showbackground=False,
+    showgrid=False,
+    showspikes=False,
+    title=dict(text="extent (um)"),
+)
+
+# the layout never varies across plots except for the title, so the nested
+# scene/layout dicts are built once at import rather than per call
+_DEFAULT_SCENE = dict(xaxis=_AXIS_STYLE, yaxis=_AXIS_STYLE, zaxis=_AXIS_STYLE)
+_DEFAULT_LAYOUT_BASE = dict(
+    hovermode=False,
+    plot_bgcolor="white",
+    scene=_DEFAULT_SCENE,
+)
+
+_kaleido_server_started = False
+
+
+def _ensure_kaleido_server():
+    """Start a persistent Kaleido render server if the installed Kaleido
+    supports it.
+
+    Kaleido 1.x starts and stops a browser engine on every
+    ``fig.write_image`` call; keeping one server alive for the session makes
+    every export after the first one much cheaper. Older Kaleido versions
+    (<1.0) keep a persistent engine themselves, so this is a no-op there.
+    """
+    global _kaleido_server_started
+    if _kaleido_server_started:
+        return
+    try:
+        import atexit
+
+        import kaleido
+        import plotly
+        import plotly.io as pio
+
+        # point Kaleido at the plotly.js bundled with the plotly package so
+        # a cold export does not fetch it (several MB) from the CDN; we never
+        # plot equations, so skip loading MathJax too
+        if hasattr(pio, "defaults"):
+            local_plotlyjs = os.path.join(
+                os.path.dirname(plotly.__file__), "package_data", "plotly.min.js"
+            )
+            if os.path.isfile(local_plotlyjs):
+                pio.defaults.plotlyjs = local_plotlyjs
+            pio.defaults.mathjax = None
+
+        if hasattr(kaleido, "start_sync_server"):
+            # the sync server initialises its browser on a background
+            # thread: if no Chrome/Chromium is installed that thread dies
+            # with ChromeNotFoundError and every later export would block
+            # forever on the dead server. Probe for a browser first, and
+            # verify the server thread survived startup, so that without a
+            # browser exports fall back to the per-call path and fail fast
+            # with Kaleido's own error instead of hanging.
+            from choreographer.browsers.chromium import Chromium
+
+            if Chromium.find_browser(skip_local=False) is None:
+                logger.info(
+                    "No Chrome/Chromium browser found; not starting a "
+                    "persistent Kaleido server"
+                )
+            else:
+                kaleido.start_sync_server()
+                server = getattr(
+                    sys.modules[kaleido.start_sync_server.__module__],
+                    "_global_server",
+                    None,
+                )
+                thread = getattr(server, "_thread", None)
+                if thread is not None:
+                    thread.join(timeout=2.0)
+                if thread is not None and not thread.is_alive():
+                    logger.warning(
+                        "Persistent Kaleido server failed to start; "
+                        "falling back to per-export rendering"
+                    )
+                    kaleido.stop_sync_server()
+                else:
+                    atexit.register(kaleido.stop_sync_server)
+    except Exception as e:
+        logger.debug("Could not start a persistent Kaleido server: %s", e)
+    _kaleido_server_started = True
+
+
+def surface_to_mesh_elements(
+    X: numpy.ndarray,
+    Y: numpy.ndarray,
+    Z: numpy.ndarray,
+    index_offset: int = 0,
+) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+    """Convert an (X, Y, Z) surface coordinate grid into mesh elements.
+
+    Triangulates the quads of the grid so that the surface can be included in
+    a :py:class:`plotly.graph_objects.Mesh3d` trace.
+
+    :param X: grid of x coordinates
+    :type X: numpy.ndarray
+    :param Y: grid of y coordinates
+    :type Y: numpy.ndarray
+    :param Z: grid of z coordinates
+    :type Z: numpy.ndarray
+    :param index_offset: offset to add to the vertex indices of the faces,
+        used when accumulating multiple surfaces into one mesh
+    :type index_offset: int
+    :returns: (vertices, faces): (V, 3) float array of vertex coordinates and
+        (F, 3) int32 array of vertex indices, one row per triangle
+    """
+    vertices = numpy.column_stack((X.ravel(), Y.ravel(), Z.ravel()))
+
+    rows, cols = X.shape
+    indices = numpy.arange(rows * cols, dtype=numpy.int32).reshape(rows, cols)
+    corner_a = indices[:-1, :-1].ravel()
+    corner_b = indices[1:, :-1].ravel()
+    corner_c = indices[:-1, 1:].ravel()
+    corner_d = indices[1:, 1:].ravel()
+    faces = numpy.concatenate(
+        (
+            numpy.column_stack((corner_a, corner_b, corner_c)),
+            numpy.column_stack((corner_b, corner_d, corner_c)),
+        )
+    )
+
+    return vertices, faces + index_offset
+
 
 def plot_3D_cell_morphology_plotly(
     nml_file: typing.Union[str, Cell, NeuroMLDocument],
@@ -27,6 +183,14 @@ def plot_3D_cell_morphology_plotly(
     nogui: bool = False,
     save_to_file: typing.Optional[str] = None,
     plot_type: str = "detailed",
+    output_format: str = "png",
+    decimate_tolerance: float = 0.0,
+    render_scale: float = 1.0,
+    width: int = 1024,
+    height: int = 768,
+    use_cache: bool = False,
+    skip_write_image: bool = False,
+    return_fig: bool = False,
 ):
     """Plot NeuroML2 cell morphology interactively using Plot.ly
 
@@ -54,22 +218,68 @@ def plot_3D_cell_morphology_plotly(
         - detailed: show detailed morphology taking into account each segment's
           width
         - constant: show morphology, but use constant line widths
+        - surface: render each segment as a 3D sphere/frustrum surface, all
+          combined into a single mesh
 
     :type plot_type: str
+    :param output_format: format for `save_to_file`, one of:
+
+        - png: rasterize with Kaleido (headless browser; slow)
+        - html: standalone HTML page rendered client-side by Plotly.js
+        - json: the plotly figure JSON
+
+        The html/json formats only serialize the figure and so are much
+        faster than the png path.
+    :type output_format: str
+    :param decimate_tolerance: if positive, merge runs of consecutive
+        near-collinear segments whose interior points stay within this
+        distance (in um) of the merged chord before line plotting. Straight
+        dendritic stretches then draw as single lines, shrinking the figure
+        considerably with little visible difference. Only applies to the
+        line plot types, not to "surface". Disabled (0) by default.
+    :type decimate_tolerance: float
+    :param render_scale: resolution multiplier for PNG export (default: 1).
+        Kaleido render time grows with the pixel count, so the default
+        favours speed; pass 2 for publication-quality figures.
+    :type render_scale: float
+    :param width: width in pixels of the exported PNG (default: 1024)
+    :type width: int
+    :param height: height in pixels of the exported PNG (default: 768)
+    :type height: int
+    :param use_cache: reuse previously exported images from
+        `~/.cache/pyneuroml/plots` when the source file and all render
+        parameters are unchanged, skipping the Plotly/Kaleido pipeline
+        entirely. Only applies when `nml_file` is a file path, since the
+        cache is invalidated by the file's modification time. Useful for
+        documentation builds and test reruns that regenerate the same
+        figures repeatedly (default: False).
+    :type use_cache: bool
+    :param skip_write_image: do not export the figure even if `save_to_file`
+        is set; useful for callers that only want the figure object
+        (default: False)
+    :type skip_write_image: bool
+    :param return_fig: return the constructed
+        :py:class:`plotly.graph_objects.Figure` (default: False)
+    :type return_fig: bool
+    :returns: the figure if `return_fig` is set, None otherwise
+
+    Setting the `PYNEUROML_HEADLESS` environment variable suppresses
+    `fig.show()` in the same way as `nogui`, which is handy for batch runs
+    and test suites.
     """
-    if plot_type not in ["detailed", "constant"]:
+    if os.environ.get("PYNEUROML_HEADLESS"):
+        nogui = True
+
+    if plot_type not in ["detailed", "constant", "surface"]:
         raise ValueError(
-            "plot_type must be one of 'detailed', 'constant', or 'schematic'"
+            "plot_type must be one of 'detailed', 'constant', 'surface'"
         )
 
+    if output_format not in ["png", "html", "json"]:
+        raise ValueError("output_format must be one of 'png', 'html', 'json'")
+
     if type(nml_file) == str:
-        nml_model = read_neuroml2_file(
-            nml_file,
-            include_includes=True,
-            check_validity_pre_include=False,
-            verbose=False,
-            optimized=True,
-        )
+        nml_model = load_plottable_nml_model(nml_file, minimal=False)
     elif isinstance(nml_file, Cell):
         nml_model = NeuroMLDocument(id="newdoc")
         nml_model.add(nml_file)
@@ -79,69 +289,246 @@ def plot_3D_cell_morphology_plotly(
         raise TypeError("Passed model is not a NeuroML file path, nor a neuroml.Cell, nor a neuroml.NeuroMLDocument")
 
     fig = go.Figure()
+    # traces are accumulated here and added in a single add_traces call:
+    # every add_trace call re-validates the figure's whole trace list
+    traces = []  # type: typing.List[typing.Union[go.Scatter3d, go.Mesh3d]]
+    title = f"3D plot of {nml_file}"
     for cell in nml_model.cells:
         title = f"3D plot of {cell.id} from {nml_file}"
 
-        for seg in cell.morphology.segments:
-            p = cell.get_actual_proximal(seg.id)
-            d = seg.distal
-            if verbose:
-                print(
-                    f"\nSegment {seg.name}, id: {seg.id} has proximal point: {p}, distal: {d}"
+        proximals = get_actual_proximals(cell)
+
+        if verbose:
+            # buffered logging rather than an unbuffered print per segment
+            for seg in cell.morphology.segments:
+                logger.info(
+                    "Segment %s, id: %s has proximal point: %s, distal: %s",
+                    seg.name,
+                    seg.id,
+                    proximals[seg.id],
+                    seg.distal,
                 )
-            width = max(p.diameter, d.diameter)
-            if width < min_width:
-                width = min_width
-            if plot_type == "constant":
-                width = min_width
-            fig.add_trace(
-                go.Scatter3d(
-                    x=[p.x, d.x],
-                    y=[p.y, d.y],
-                    z=[p.z, d.z],
-                    name=None,
-                    marker={"size": 2, "color": "blue"},
-                    line={"width": width, "color": "blue"},
-                    mode="lines",
-                    showlegend=False,
-                    hoverinfo="skip",
+
+        if plot_type == "surface":
+            # accumulate the surfaces of all segments into a single mesh:
+            # serializing and rendering one trace per segment is very slow for
+            # cells with many segments
+            all_vertices = []  # type: typing.List[numpy.ndarray]
+            all_faces = []  # type: typing.List[numpy.ndarray]
+            vertex_count = 0
+
+            seg_arr = get_cell_segments_array(cell)
+            spherical_mask = (seg_arr[:, 0:4] == seg_arr[:, 4:8]).all(axis=1)
+
+            surfaces = []  # type: typing.List[typing.Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]
+
+            # generate the surfaces of all spherical segments in vectorised
+            # calls; spheres that are tiny relative to the cell extent (e.g.
+            # dendritic beads) get a much coarser mesh than large somas,
+            # which keeps the vertex count down without visible difference
+            if spherical_mask.any():
+                sph = seg_arr[spherical_mask]
+                extent = float(numpy.ptp(seg_arr[:, 0:3], axis=0).max())
+                small = (
+                    sph[:, 3] < 0.01 * extent
+                    if extent > 0
+                    else numpy.zeros(len(sph), dtype=bool)
                 )
+                for subset, resolution in ((sph[~small], 20), (sph[small], 6)):
+                    if len(subset) > 0:
+                        Xs, Ys, Zs = get_sphere_surface(
+                            subset[:, 0],
+                            subset[:, 1],
+                            subset[:, 2],
+                            subset[:, 3] / 2,
+                            resolution=resolution,
+                        )
+                        surfaces.extend(zip(Xs, Ys, Zs))
+
+            # and the frustrums of all other segments in one batched call
+            frustrums = seg_arr[~spherical_mask]
+            if len(frustrums) > 0:
+                for X, Y, Z in get_frustrum_surfaces(
+                    frustrums[:, 0:3],
+                    frustrums[:, 4:7],
+                    numpy.maximum(frustrums[:, 3] / 2, min_width / 2),
+                    numpy.maximum(frustrums[:, 7] / 2, min_width / 2),
+                    capped=True,
+                ):
+                    surfaces.extend(zip(X, Y, Z))
+
+            for X, Y, Z in surfaces:
+                vertices, faces = surface_to_mesh_elements(X, Y, Z, vertex_count)
+                all_vertices.append(vertices)
+                all_faces.append(faces)
+                vertex_count += len(vertices)
+
+            if vertex_count > 0:
+                # round to submicron: imperceptible in the plot, but
+                # produces a noticeably smaller JSON payload
+                vertices = numpy.around(numpy.concatenate(all_vertices), 3)
+                faces = numpy.concatenate(all_faces)
+                traces.append(
+                    go.Mesh3d(
+                        x=vertices[:, 0],
+                        y=vertices[:, 1],
+                        z=vertices[:, 2],
+                        i=faces[:, 0],
+                        j=faces[:, 1],
+                        k=faces[:, 2],
+                        color="blue",
+                        flatshading=True,
+                        showlegend=False,
+                        hoverinfo="skip",
+                    )
+                )
+        else:
+            # draw all segments as line traces, with None separating the
+            # individual segments so that they are not connected to each
+            # other: one trace per segment is very slow to serialize and
+            # render.
+            #
+            # plotly only supports one line width per trace, so segments are
+            # quantized into a few width buckets, with one trace per bucket
+            seg_arr = get_cell_segments_array(cell)
+            if decimate_tolerance > 0:
+                seg_arr = decimate_collinear_segments(seg_arr, decimate_tolerance)
+            widths = numpy.maximum(
+                numpy.maximum(seg_arr[:, 3], seg_arr[:, 7]), min_width
             )
+            if plot_type == "constant":
+                widths = numpy.full(len(seg_arr), min_width)
+
+            unique_widths = numpy.unique(widths)
+            if len(unique_widths) > MAX_LINE_WIDTH_BUCKETS:
+                bucket_edges = numpy.quantile(
+                    widths, [0.25, 0.5, 0.75]
+                )  # type: numpy.ndarray
+                bucket_indices = numpy.digitize(widths, bucket_edges)
+            else:
+                bucket_indices = numpy.searchsorted(unique_widths, widths)
 
-        fig.update_layout(
-            title={"text": title},
-            hovermode=False,
-            plot_bgcolor="white",
-            scene=dict(
-                xaxis=dict(
-                    backgroundcolor="white",
-                    showbackground=False,
-                    showgrid=False,
-                    showspikes=False,
-                    title=dict(text="extent (um)"),
-                ),
-                yaxis=dict(
-                    backgroundcolor="white",
-                    showbackground=False,
-                    showgrid=False,
-                    showspikes=False,
-                    title=dict(text="extent (um)"),
-                ),
-                zaxis=dict(
-                    backgroundcolor="white",
-                    showbackground=False,
-                    showgrid=False,
-                    showspikes=False,
-                    title=dict(text="extent (um)"),
-                ),
-            ),
+            for bucket in numpy.unique(bucket_indices):
+                mask = bucket_indices == bucket
+                num_segs = int(numpy.count_nonzero(mask))
+
+                xs = numpy.full(3 * num_segs, numpy.nan, dtype=numpy.float32)
+                ys = numpy.full(3 * num_segs, numpy.nan, dtype=numpy.float32)
+                zs = numpy.full(3 * num_segs, numpy.nan, dtype=numpy.float32)
+                xs[0::3] = seg_arr[mask, 0]
+                xs[1::3] = seg_arr[mask, 4]
+                ys[0::3] = seg_arr[mask, 1]
+                ys[1::3] = seg_arr[mask, 5]
+                zs[0::3] = seg_arr[mask, 2]
+                zs[1::3] = seg_arr[mask, 6]
+
+                traces.append(
+                    go.Scatter3d(
+                        x=xs,
+                        y=ys,
+                        z=zs,
+                        line={
+                            "width": float(numpy.median(widths[mask])),
+                            "color": "blue",
+                        },
+                        mode="lines",
+                        showlegend=False,
+                        hoverinfo="skip",
+                    )
+                )
+
+    if traces:
+        fig.add_traces(traces)
+
+    # layout, display and export happen once for the complete figure: doing
+    # this inside the cell loop re-serialized and re-exported the growing
+    # figure once per cell, overwriting the same file each time
+    fig.update_layout({**_DEFAULT_LAYOUT_BASE, "title": {"text": title}})
+    if save_to_file and not skip_write_image:
+        # an explicit html/json file name selects the browser-free export
+        # paths without the caller needing to set output_format as well
+        if output_format == "png":
+            extension = os.path.splitext(save_to_file)[1].lower()
+            if extension in [".html", ".json"]:
+                output_format = extension[1:]
+        logger.info(
+            "Saving image to %s of plot: %s"
+            % (os.path.abspath(save_to_file), title)
         )
-        if not nogui:
-            fig.show()
-        if save_to_file:
-            logger.info(
-                "Saving image to %s of plot: %s"
-                % (os.path.abspath(save_to_file), title)
+        cache_file = None
+        if use_cache and isinstance(nml_file, str):
+            import hashlib
+            import shutil
+
+            from pyneuroml import __version__
+
+            source = os.path.abspath(nml_file)
+            key = hashlib.md5(
+                repr(
+                    (
+                        source,
+                        os.path.getmtime(source),
+                        __version__,
+                        plot_type,
+                        min_width,
+                        decimate_tolerance,
+                        output_format,
+                        render_scale,
+                        width,
+                        height,
+                    )
+                ).encode()
+            ).hexdigest()
+            cache_dir = os.path.join(
+                os.path.expanduser("~"), ".cache", "pyneuroml", "plots"
+            )
+            cache_file = os.path.join(
+                cache_dir, key + os.path.splitext(save_to_file)[1]
+            )
+            if os.path.isfile(cache_file):
+                logger.info("Reusing cached export %s", cache_file)
+                shutil.copy(cache_file, save_to_file)
+                if not nogui:
+                    fig.show()
+                if return_fig:
+                    return fig
+                return
+            os.makedirs(cache_dir, exist_ok=True)
+
+        if output_format == "html":
+            # rendered client-side by Plotly.js in the browser: no headless
+            # browser round-trip is needed to produce the file
+            fig.write_html(save_to_file, include_plotlyjs="cdn", full_html=True)
+            if not nogui:
+                fig.show()
+        elif output_format == "json":
+            fig.write_json(save_to_file)
+            if not nogui:
+                fig.show()
+        elif nogui:
+            _ensure_kaleido_server()
+            fig.write_image(
+                save_to_file, scale=render_scale, width=width, height=height
             )
-            fig.write_image(save_to_file, scale=2, width=1024, height=768)
-            logger.info("Saved image to %s of plot: %s" % (save_to_file, title))
+        else:
+            # the kaleido export spawns a browser subprocess and blocks
+            # for seconds; when the figure is also shown interactively,
+            # run the export in the background so the display is not
+            # delayed behind it
+            _ensure_kaleido_server()
+            writer = threading.Thread(
+                target=fig.write_image,
+                args=(save_to_file,),
+                kwargs={"scale": render_scale, "width": width, "height": height},
+            )
+            writer.start()
+            fig.show()
+            writer.join()
+        if cache_file is not None and os.path.isfile(save_to_file):
+            shutil.copy(save_to_file, cache_file)
+        logger.info("Saved image to %s of plot: %s" % (save_to_file, title))
+    elif not nogui:
+        fig.show()
+
+    if return_fig:
+        return fig
@@ -19,13 +19,14 @@ import numpy
 import progressbar
 from neuroml import Cell, NeuroMLDocument, SegmentGroup, Segment
 from neuroml.neuro_lex_ids import neuro_lex_ids
-from pyneuroml.pynml import read_neuroml2_file
 from pyneuroml.utils import extract_position_info
 from pyneuroml.utils.plot import (
     DEFAULTS,
+    get_actual_proximals,
     get_cell_bound_box,
     get_next_hex_color,
-    load_minimal_morphplottable__model,
+    get_segment_group_sets,
+    load_plottable_nml_model,
 )
 from scipy.spatial.transform import Rotation
 from vispy import app, scene, use
@@ -318,19 +319,7 @@ def plot_interactive_3D(
         logger.info(f"Visualising {nml_file}")
 
     if type(nml_file) is str:
-        # load without optimization for older HDF5 API
-        # TODO: check if this is required: must for MultiscaleISN
-        if nml_file.endswith(".h5"):
-            nml_model = read_neuroml2_file(nml_file)
-        else:
-            nml_model = read_neuroml2_file(
-                nml_file,
-                include_includes=False,
-                check_validity_pre_include=False,
-                verbose=False,
-                optimized=True,
-            )
-            load_minimal_morphplottable__model(nml_model, nml_file)
+        nml_model = load_plottable_nml_model(nml_file)
 
         if title is None:
             try:
@@ -510,7 +499,7 @@ def plot_interactive_3D(
                     or cell.id in point_cells
                 ):
                     # assume that soma is 0, plot point at where soma should be
-                    soma_x_y_z = cell.get_actual_proximal(0)
+                    soma_x_y_z = get_actual_proximals(cell)[0]
                     pos1 = [
                         pos[0] + soma_x_y_z.x,
                         pos[1] + soma_x_y_z.y,
@@ -678,18 +667,7 @@ def plot_3D_cell_morphology(
             "No cell provided. If you would like to plot a network of point neurons, consider using `plot_2D_point_cells` instead"
         )
 
-    try:
-        soma_segs = cell.get_all_segments_in_group("soma_group")
-    except Exception:
-        soma_segs = []
-    try:
-        dend_segs = cell.get_all_segments_in_group("dendrite_group")
-    except Exception:
-        dend_segs = []
-    try:
-        axon_segs = cell.get_all_segments_in_group("axon_group")
-    except Exception:
-        axon_segs = []
+    soma_segs, dend_segs, axon_segs = get_segment_group_sets(cell)
 
     if current_canvas is None or current_view is None:
         view_min, view_max = get_cell_bound_box(cell)
@@ -717,8 +695,9 @@ def plot_3D_cell_morphology(
     if meshdata is None:
         meshdata = {}
 
+    proximals = get_actual_proximals(cell)
     for seg in cell.morphology.segments:
-        p = cell.get_actual_proximal(seg.id)
+        p = proximals[seg.id]
         d = seg.distal
         length = cell.get_segment_length(seg.id)
 
@@ -965,18 +944,7 @@ def plot_3D_schematic(
     if title == "":
         title = f"3D schematic of segment groups from {cell.id}"
 
-    try:
-        soma_segs = cell.get_all_segments_in_group("soma_group")
-    except Exception:
-        soma_segs = []
-    try:
-        dend_segs = cell.get_all_segments_in_group("dendrite_group")
-    except Exception:
-        dend_segs = []
-    try:
-        axon_segs = cell.get_all_segments_in_group("axon_group")
-    except Exception:
-        axon_segs = []
+    soma_segs, dend_segs, axon_segs = get_segment_group_sets(cell)
 
     # if no segment groups are given, do them all
     if segment_groups is None:
@@ -1014,7 +982,7 @@ def plot_3D_schematic(
         # get proximal and distal points
         first_seg = segs[0]  # type: Segment
         last_seg = segs[-1]  # type: Segment
-        first_prox = cell.get_actual_proximal(first_seg.id)  # type: Point3DWithDiam
+        first_prox = get_actual_proximals(cell)[first_seg.id]  # type: Point3DWithDiam
         last_dist = last_seg.distal  # type: Point3DWithDiam
 
         length = math.dist(
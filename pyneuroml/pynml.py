@@ -15,11 +15,15 @@ from __future__ import unicode_literals
 # py3.7, 3.8 require this to use standard collections as generics
 from __future__ import annotations
 import warnings
+import concurrent.futures
+import functools
+import importlib
 import os
 import shutil
 import sys
 import subprocess
 import math
+import time
 from datetime import datetime
 import textwrap
 import random
@@ -31,7 +35,8 @@ import pprint
 import logging
 import tempfile
 import typing
-import traceback
+
+import numpy
 
 import lems.model.model as lems_model
 import lems
@@ -1212,13 +1217,13 @@ def run_lems_with_jneuroml(
     logger.info(
         "Loading LEMS file: {} and running with jNeuroML".format(lems_file_name)
     )
-    post_args = ""
-    post_args += gui_string(nogui)
-    post_args += include_string(paths_to_include)
+    post_args = _gui_args(nogui) + _include_args(paths_to_include)
 
-    t_run = datetime.now()
+    t_run = time.time()
 
-    if not skip_run:
+    if skip_run:
+        success = _syntax_check_lems_file(lems_file_name, exec_in_dir)
+    else:
         success = run_jneuroml(
             "",
             lems_file_name,
@@ -1298,14 +1303,11 @@ def include_string(paths_to_include: typing.Union[str, tuple[str], list[str]]) -
     :type paths_to_include: str or list(str) or tuple(str)
     :returns: include string to be used with jnml.
     """
-    if paths_to_include:
-        if type(paths_to_include) is str:
-            paths_to_include = [paths_to_include]
-    if type(paths_to_include) in (tuple, list):
-        result = " -I '%s'" % ":".join(paths_to_include)
-    else:
-        result = ""
-    return result
+    if not paths_to_include:
+        return ""
+    if isinstance(paths_to_include, str):
+        paths_to_include = (paths_to_include,)
+    return " -I '%s'" % ":".join(paths_to_include)
 
 
 def gui_string(nogui: bool) -> str:
@@ -1318,6 +1320,77 @@ def gui_string(nogui: bool) -> str:
     return " -nogui" if nogui else ""
 
 
+def _syntax_check_lems_file(lems_file_name: str, exec_in_dir: str = ".") -> bool:
+    """Check that a LEMS file is well-formed XML, without starting a JVM.
+
+    Used by the `run_lems_with_*` functions when `skip_run` is set: their
+    documented semantics are "only parse the file", which lxml covers in
+    milliseconds where a jnml invocation would pay the JVM startup cost.
+
+    :param lems_file_name: name of LEMS file to check
+    :type lems_file_name: str
+    :param exec_in_dir: directory the file is relative to, if not the cwd
+    :type exec_in_dir: str
+    :returns: True if the file parses, False otherwise
+    """
+    file_path = lems_file_name
+    if not os.path.isfile(file_path):
+        file_path = os.path.join(exec_in_dir, lems_file_name)
+    try:
+        etree.parse(file_path)
+        return True
+    except etree.XMLSyntaxError as e:
+        logger.error("LEMS file %s is not well-formed XML: %s" % (lems_file_name, e))
+        return False
+    except OSError as e:
+        logger.error("Could not read LEMS file %s: %s" % (lems_file_name, e))
+        return False
+
+
+def _include_args(
+    paths_to_include: typing.Union[str, tuple[str], list[str]],
+) -> list[str]:
+    """Argv-list counterpart of :py:func:`include_string`.
+
+    :param paths_to_include: path or list or tuple of paths to be included
+    :type paths_to_include: str or list(str) or tuple(str)
+    :returns: argv fragment to be used with jnml
+    """
+    if not paths_to_include:
+        return []
+    if isinstance(paths_to_include, str):
+        paths_to_include = (paths_to_include,)
+    return ["-I", ":".join(paths_to_include)]
+
+
+def _gui_args(nogui: bool) -> list[str]:
+    """Argv-list counterpart of :py:func:`gui_string`.
+
+    :param nogui: toggle whether GUI should be used or not
+    :type nogui: bool
+    :returns: argv fragment to be used with jnml
+    """
+    return ["-nogui"] if nogui else []
+
+
+def _shlex_join(command: typing.List[str]) -> str:
+    """Shell-quote an argv list for display (``shlex.join`` needs Python >= 3.8).
+
+    :param command: command as an argv list
+    :type command: list(str)
+    :returns: the command as a single shell-escaped string
+    """
+    return " ".join(shlex.quote(arg) for arg in command)
+
+
+# engine name -> run_lems_with_* function, built once on first use (the run
+# functions are defined further down in this module)
+_engine_dispatch = {}  # type: typing.Dict[str, typing.Callable]
+
+# whether sys.path has already been merged into PYTHONPATH for NEURON runs
+_neuron_pythonpath_seeded = False
+
+
 def run_lems_with(engine: str, *args: typing.Any, **kwargs: typing.Any):
     """Run LEMS with specified engine.
 
@@ -1335,18 +1408,19 @@ def run_lems_with(engine: str, *args: typing.Any, **kwargs: typing.Any):
     :returns: return value of called method
 
     """
-    function_tuple = inspect.getmembers(sys.modules[__name__], inspect.isfunction)
-    found = False
-    for fname, function in function_tuple:
-        if fname.startswith("run_lems_with") and fname.endswith(engine):
-            print(f"Running with {fname}")
-            found = True
-            return function(*args, **kwargs)
-
-    if found is False:
+    if not _engine_dispatch:
+        for fname, function in globals().items():
+            if fname.startswith("run_lems_with_") and inspect.isfunction(function):
+                _engine_dispatch[fname[len("run_lems_with_"):]] = function
+
+    function = _engine_dispatch.get(engine)
+    if function is None:
         logger.error(f"Could not find engine {engine}. Exiting.")
         return False
 
+    print(f"Running with {function.__name__}")
+    return function(*args, **kwargs)
+
 
 def run_lems_with_jneuroml_neuron(
     lems_file_name: str,
@@ -1409,25 +1483,29 @@ def run_lems_with_jneuroml_neuron(
         "Loading LEMS file: {} and running with jNeuroML_NEURON".format(lems_file_name)
     )
 
-    post_args = " -neuron"
+    post_args = ["-neuron"]
     if not only_generate_scripts:  # and jnml_runs_neuron:
-        post_args += " -run"
+        post_args.append("-run")
     if compile_mods:
-        post_args += " -compile"
+        post_args.append("-compile")
 
-    post_args += gui_string(nogui)
-    post_args += include_string(paths_to_include)
+    post_args += _gui_args(nogui) + _include_args(paths_to_include)
 
-    t_run = datetime.now()
+    t_run = time.time()
     if skip_run:
-        success = True
+        success = _syntax_check_lems_file(lems_file_name, exec_in_dir)
     else:
         # Fix PYTHONPATH for NEURON: has been an issue on HBP Collaboratory...
-        if "PYTHONPATH" not in os.environ:
-            os.environ["PYTHONPATH"] = ""
-        for path in sys.path:
-            if path + ":" not in os.environ["PYTHONPATH"]:
-                os.environ["PYTHONPATH"] = "%s:%s" % (path, os.environ["PYTHONPATH"])
+        # sys.path rarely changes within a process and the merged value is
+        # inherited by every subprocess, so the merge only needs doing once
+        global _neuron_pythonpath_seeded
+        if not _neuron_pythonpath_seeded:
+            existing = os.environ.get("PYTHONPATH", "")
+            known_paths = set(existing.split(":"))
+            missing = [path for path in sys.path if path and path not in known_paths]
+            if missing:
+                os.environ["PYTHONPATH"] = ":".join(missing + [existing]).strip(":")
+            _neuron_pythonpath_seeded = True
 
         logger.debug("PYTHONPATH for NEURON: {}".format(os.environ["PYTHONPATH"]))
 
@@ -1547,21 +1625,20 @@ def run_lems_with_jneuroml_netpyne(
         "Loading LEMS file: {} and running with jNeuroML_NetPyNE".format(lems_file_name)
     )
 
-    post_args = " -netpyne"
+    post_args = ["-netpyne"]
 
     if num_processors != 1:
-        post_args += " -np %i" % num_processors
+        post_args += ["-np", "%i" % num_processors]
     if not only_generate_scripts and not only_generate_json:
-        post_args += " -run"
+        post_args.append("-run")
     if only_generate_json:
-        post_args += " -json"
+        post_args.append("-json")
 
-    post_args += gui_string(nogui)
-    post_args += include_string(paths_to_include)
+    post_args += _gui_args(nogui) + _include_args(paths_to_include)
 
-    t_run = datetime.now()
+    t_run = time.time()
     if skip_run:
-        success = True
+        success = _syntax_check_lems_file(lems_file_name, exec_in_dir)
     else:
         if return_string is True:
             (success, output_string) = run_jneuroml(
@@ -1661,14 +1738,14 @@ def run_lems_with_jneuroml_brian2(
         "Loading LEMS file: {} and running with jNeuroML_Brian2".format(lems_file_name)
     )
 
-    post_args = " -brian2"
+    post_args = ["-brian2"]
 
-    # post_args += gui_string(nogui)
-    # post_args += include_string(paths_to_include)
+    # post_args += _gui_args(nogui)
+    # post_args += _include_args(paths_to_include)
 
-    t_run = datetime.now()
+    t_run = time.time()
     if skip_run:
-        success = True
+        success = _syntax_check_lems_file(lems_file_name, exec_in_dir)
     else:
         success = run_jneuroml(
             "",
@@ -1688,8 +1765,12 @@ def run_lems_with_jneuroml_brian2(
             )
         )
         brian2_py_name = lems_file_name.replace(".xml", "_brian2")
-        exec("import %s" % brian2_py_name)
-        sys.argv = old_sys_args
+        try:
+            # the import runs the simulation; importlib goes through the
+            # normal sys.modules cache and skips compiling an exec string
+            importlib.import_module(brian2_py_name)
+        finally:
+            sys.argv = old_sys_args
         logger.info("Finished Brian2 simulation, back to {}".format(sys.argv))
 
     if not success:
@@ -1756,10 +1837,27 @@ def run_lems_with_eden(
         return True
 
 
+def _resolve_output_file(name: str, dirs: typing.List[str]) -> str:
+    """Find a simulation output file, trying each directory in turn.
+
+    :param name: file name as given in the LEMS file
+    :type name: str
+    :param dirs: candidate directories, most likely first
+    :type dirs: list of str
+    :returns: full path of the first existing candidate
+    :raises OSError: if the file is not found in any candidate directory
+    """
+    for d in dirs:
+        file_name = os.path.join(d, name)
+        if os.path.isfile(file_name):
+            return file_name
+    raise OSError("Could not find simulation output file %s" % name)
+
+
 def reload_saved_data(
     lems_file_name: str,
     base_dir: str = ".",
-    t_run: datetime = datetime(1900, 1, 1),
+    t_run: typing.Union[datetime, float] = 0.0,
     plot: bool = False,
     show_plot_already: bool = True,
     simulator: typing.Optional[str] = None,
@@ -1773,8 +1871,10 @@ def reload_saved_data(
     :type lems_file_name: str
     :param base_dir: directory to run in
     :type base_dir: str
-    :param t_run: time of run
-    :type t_run: datetime
+    :param t_run: time the simulation was started, as seconds since the
+        epoch (or a datetime for backwards compatibility); output files older
+        than this are rejected as stale
+    :type t_run: float or datetime
     :param plot: toggle plotting
     :type plot: bool
     :param show_plot_already: toggle if plots should be shown
@@ -1792,6 +1892,9 @@ def reload_saved_data(
     TODO: remove unused vebose argument (needs checking to see if is being
     used in other places)
     """
+    if isinstance(t_run, datetime):
+        t_run = t_run.timestamp()
+
     if not os.path.isfile(lems_file_name):
         real_lems_file = os.path.realpath(os.path.join(base_dir, lems_file_name))
     else:
@@ -1805,6 +1908,7 @@ def reload_saved_data(
     # Could use pylems to parse all this...
     traces = {}  # type: dict
     events = {}  # type: dict
+    files_to_remove = []  # type: typing.List[str]
 
     if plot:
         import matplotlib.pyplot as plt
@@ -1815,67 +1919,65 @@ def reload_saved_data(
     sim = tree.getroot().find("Simulation")
     ns_prefix = ""
 
-    possible_prefixes = ["{http://www.neuroml.org/lems/0.7.2}"]
     if sim is None:
-        # print(tree.getroot().nsmap)
-        # print(tree.getroot().getchildren())
-        for pre in possible_prefixes:
-            for comp in tree.getroot().findall(pre + "Component"):
-                if comp.attrib["type"] == "Simulation":
-                    ns_prefix = pre
-                    sim = comp
+        # single pass over the document, recovering the namespace from the
+        # matching tag instead of probing a list of candidate prefixes
+        for el in tree.getroot().iter():
+            tag = el.tag
+            if (
+                isinstance(tag, str)
+                and tag.endswith("}Component")
+                and el.attrib.get("type") == "Simulation"
+            ):
+                sim = el
+                ns_prefix = tag[: tag.index("}") + 1]
+                break
+
+    # fold the prefix into the tag names once instead of concatenating at
+    # every lookup
+    tag_outfile = ns_prefix + "OutputFile"
+    tag_outcol = ns_prefix + "OutputColumn"
+    tag_evtfile = ns_prefix + "EventOutputFile"
+    tag_evtsel = ns_prefix + "EventSelection"
 
     if reload_events:
-        event_output_files = sim.findall(ns_prefix + "EventOutputFile")
+        event_output_files = list(sim.iterfind(tag_evtfile))
         for i, of in enumerate(event_output_files):
             name = of.attrib["fileName"]
-            file_name = os.path.join(base_dir, name)
-            if not os.path.isfile(file_name):  # If not relative to the LEMS file...
-                file_name = os.path.join(base_lems_file_path, name)
-
-            # if not os.path.isfile(file_name): # If not relative to the LEMS file...
-            #    file_name = os.path.join(os.getcwd(),name)
-            # ... try relative to cwd.
-            # if not os.path.isfile(file_name): # If not relative to the LEMS file...
-            #    file_name = os.path.join(os.getcwd(),'NeuroML2','results',name)
-            # ... try relative to cwd in NeuroML2/results subdir.
-            if not os.path.isfile(file_name):  # If not relative to the base dir...
-                raise OSError(
-                    ("Could not find simulation output " "file %s" % file_name)
-                )
+            # relative to the base dir, else the LEMS file
+            file_name = _resolve_output_file(name, [base_dir, base_lems_file_path])
             format = of.attrib["format"]
             logger.info(
                 "Loading saved events from %s (format: %s)" % (file_name, format)
             )
             selections = {}
-            for col in of.findall(ns_prefix + "EventSelection"):
+            for col in of.iterfind(tag_evtsel):
                 id = int(col.attrib["id"])
                 select = col.attrib["select"]
                 events[select] = []
                 selections[id] = select
 
-            with open(file_name) as f:
-                for line in f:
-                    values = line.split()
-                    if format == "TIME_ID":
-                        t = float(values[0])
-                        id = int(values[1])
-                    elif format == "ID_TIME":
-                        id = int(values[0])
-                        t = float(values[1])
-                    logger.debug(
-                        "Found a event in cell %s (%s) at t = %s"
-                        % (id, selections[id], t)
-                    )
-                    events[selections[id]].append(t)
+            # load and bucket all events in numpy instead of splitting and
+            # converting each line in Python
+            data = numpy.loadtxt(file_name, ndmin=2)
+            if data.size > 0:
+                if format == "TIME_ID":
+                    ts = data[:, 0]
+                    ids = data[:, 1].astype(numpy.int64)
+                else:  # ID_TIME
+                    ids = data[:, 0].astype(numpy.int64)
+                    ts = data[:, 1]
+                order = numpy.argsort(ids, kind="stable")
+                ids = ids[order]
+                ts = ts[order]
+                for id, select in selections.items():
+                    lo, hi = numpy.searchsorted(ids, [id, id + 1])
+                    events[select] = ts[lo:hi].tolist()
 
             if remove_dat_files_after_load:
-                logger.warning(
-                    "Removing file %s after having loading its data!" % file_name
-                )
-                os.remove(file_name)
+                files_to_remove.append(file_name)
 
-    output_files = sim.findall(ns_prefix + "OutputFile")
+    output_files = list(sim.iterfind(tag_outfile))
     n_output_files = len(output_files)
     if plot:
         rows = int(max(1, math.ceil(n_output_files / float(3))))
@@ -1886,29 +1988,33 @@ def reload_saved_data(
         if n_output_files > 1:
             ax = ax.ravel()
 
-    for i, of in enumerate(output_files):
-        traces["t"] = []
+    # resolve every output file and its columns first, so that the actual
+    # parsing can be handed to a thread pool below
+    output_file_names = []  # type: typing.List[str]
+    output_file_cols = []  # type: typing.List[typing.List[str]]
+    traces["t"] = []
+    for of in output_files:
         name = of.attrib["fileName"]
-        file_name = os.path.join(base_dir, name)
-
-        if not os.path.isfile(file_name):  # If not relative to the LEMS file...
-            file_name = os.path.join(base_lems_file_path, name)
-
-        if not os.path.isfile(file_name):  # If not relative to the LEMS file...
-            file_name = os.path.join(os.getcwd(), name)
-
-            # ... try relative to cwd.
-        if not os.path.isfile(file_name):  # If not relative to the LEMS file...
-            file_name = os.path.join(os.getcwd(), "NeuroML2", "results", name)
-            # ... try relative to cwd in NeuroML2/results subdir.
-        if not os.path.isfile(file_name):  # If not relative to the LEMS file...
-            raise OSError(("Could not find simulation output " "file %s" % file_name))
-        t_file_mod = datetime.fromtimestamp(os.path.getmtime(file_name))
+        # relative to the base dir, the LEMS file, cwd, or NeuroML2/results
+        file_name = _resolve_output_file(
+            name,
+            [
+                base_dir,
+                base_lems_file_path,
+                os.getcwd(),
+                os.path.join(os.getcwd(), "NeuroML2", "results"),
+            ],
+        )
+        t_file_mod = os.path.getmtime(file_name)
         if t_file_mod < t_run:
             raise Exception(
                 "Expected output file %s has not been modified since "
                 "%s but the simulation was run later at %s."
-                % (file_name, t_file_mod, t_run)
+                % (
+                    file_name,
+                    datetime.fromtimestamp(t_file_mod),
+                    datetime.fromtimestamp(t_run),
+                )
             )
 
         logger.debug(
@@ -1918,22 +2024,39 @@ def reload_saved_data(
 
         cols = []
         cols.append("t")
-        for col in of.findall(ns_prefix + "OutputColumn"):
+        for col in of.iterfind(tag_outcol):
             quantity = col.attrib["quantity"]
             traces[quantity] = []
             cols.append(quantity)
-
-        with open(file_name) as f:
-            for line in f:
-                values = line.split()
-                for vi in range(len(values)):
-                    traces[cols[vi]].append(float(values[vi]))
+        output_file_names.append(file_name)
+        output_file_cols.append(cols)
+
+    # parse the files with numpy's C parser rather than a Python float()
+    # loop over every single value; with multiple output files the loads
+    # run concurrently, overlapping their file I/O
+    if len(output_file_names) > 1:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(output_file_names), os.cpu_count() or 1)
+        ) as pool:
+            output_file_data = list(
+                pool.map(lambda fn: numpy.loadtxt(fn, ndmin=2), output_file_names)
+            )
+    else:
+        output_file_data = [numpy.loadtxt(fn, ndmin=2) for fn in output_file_names]
+
+    for i, (file_name, cols, data) in enumerate(
+        zip(output_file_names, output_file_cols, output_file_data)
+    ):
+        if data.size > 0:
+            for vi, key in enumerate(cols[: data.shape[1]]):
+                traces[key] = data[:, vi].tolist()
+        else:
+            # an empty file must not inherit the previous file's time
+            # vector, or plotting its (empty) columns fails
+            traces["t"] = []
 
         if remove_dat_files_after_load:
-            logger.warning(
-                "Removing file %s after having loading its data!" % file_name
-            )
-            os.remove(file_name)
+            files_to_remove.append(file_name)
 
         if plot:
             info = "Data loaded from %s%s" % (
@@ -1943,39 +2066,54 @@ def reload_saved_data(
             logger.warning("Reloading: %s" % info)
             plt.get_current_fig_manager().set_window_title(info)
 
+            if n_output_files > 1:
+                ax_ = ax[i]
+            else:
+                ax_ = ax
+            ax_.set_xlabel("Time (ms)")
+            ax_.set_ylabel("(SI units...)")
+            ax_.xaxis.grid(True)
+            ax_.yaxis.grid(True)
+
+            # defer data-limit updates until all traces have been added,
+            # rather than recomputing limits after every plot call
+            ax_.set_autoscale_on(False)
             legend = False
             for key in cols:
-                if n_output_files > 1:
-                    ax_ = ax[i]
-                else:
-                    ax_ = ax
-                ax_.set_xlabel("Time (ms)")
-                ax_.set_ylabel("(SI units...)")
-                ax_.xaxis.grid(True)
-                ax_.yaxis.grid(True)
-
                 if key != "t":
                     ax_.plot(traces["t"], traces[key], label=key)
                     logger.debug("Adding trace for: %s, from: %s" % (key, file_name))
                     ax_.used = True
                     legend = True
+            ax_.set_autoscale_on(True)
+            ax_.relim()
+            ax_.autoscale_view(True, True, True)
 
-                if legend:
-                    if n_output_files > 1:
-                        ax_.legend(
-                            loc="upper right", fancybox=True, shadow=True, ncol=4
-                        )  # ,bbox_to_anchor=(0.5, -0.05))
-                    else:
-                        ax_.legend(
-                            loc="upper center",
-                            bbox_to_anchor=(0.5, -0.05),
-                            fancybox=True,
-                            shadow=True,
-                            ncol=4,
-                        )
+            if legend:
+                if n_output_files > 1:
+                    ax_.legend(
+                        loc="upper right", fancybox=True, shadow=True, ncol=4
+                    )  # ,bbox_to_anchor=(0.5, -0.05))
+                else:
+                    ax_.legend(
+                        loc="upper center",
+                        bbox_to_anchor=(0.5, -0.05),
+                        fancybox=True,
+                        shadow=True,
+                        ncol=4,
+                    )
 
     #  print(traces.keys())
 
+    if files_to_remove:
+        # one summary record instead of a formatted warning per file
+        logger.warning(
+            "Removing %i data file(s) after having loaded their data!"
+            % len(files_to_remove)
+        )
+        for file_name in files_to_remove:
+            os.unlink(file_name)
+
     if plot and show_plot_already:
         if n_output_files > 1:
             ax_ = ax
@@ -2333,9 +2471,13 @@ def evaluate_arguments(args):
         )
 
 
+@functools.lru_cache(maxsize=None)
 def get_path_to_jnml_jar() -> str:
     """Get the path to the jNeuroML jar included with PyNeuroML.
 
+    The path never changes during a process, so it is computed once and
+    cached for the repeated calls made by batched runs.
+
     :returns: path of jar file
     """
     script_dir = os.path.dirname(os.path.realpath(__file__))
@@ -2346,9 +2488,9 @@ def get_path_to_jnml_jar() -> str:
 
 
 def run_jneuroml(
-    pre_args: str,
+    pre_args: typing.Union[str, typing.List[str]],
     target_file: str,
-    post_args: str,
+    post_args: typing.Union[str, typing.List[str]],
     max_memory: str = DEFAULTS["default_java_max_memory"],
     exec_in_dir: str = ".",
     verbose: bool = DEFAULTS["v"],
@@ -2358,8 +2500,8 @@ def run_jneuroml(
 ) -> typing.Union[tuple[bool, str], bool]:
     """Run jnml with provided arguments.
 
-    :param pre_args: pre-file name arguments
-    :type pre_args: list of strings
+    :param pre_args: pre-file name arguments, as a string or an argv list
+    :type pre_args: str or list(str)
     :param target_file: LEMS or NeuroML file to run jnml on
     :type target_file: str
     :param max_memory: maximum memory allowed for use by the JVM
@@ -2392,7 +2534,11 @@ def run_jneuroml(
             exit_on_fail,
         )
     )
-    if post_args and "nogui" in post_args and not os.name == "nt":
+    if isinstance(post_args, str):
+        has_nogui = bool(post_args) and "nogui" in post_args
+    else:
+        has_nogui = any("nogui" in arg for arg in post_args or [])
+    if has_nogui and not os.name == "nt":
         pre_jar = " -Djava.awt.headless=true"
     else:
         pre_jar = ""
@@ -2402,9 +2548,26 @@ def run_jneuroml(
     retcode = -1
 
     try:
-        command = f'java -Xmx{max_memory} {pre_jar} -jar  "{jar_path}" {pre_args} {target_file} {post_args}'
+        # built as an argv list: no shell process and no runtime quoting
+        # hazards for paths containing spaces
+        command = ["java", f"-Xmx{max_memory}"]
+        if pre_jar:
+            command.append("-Djava.awt.headless=true")
+        command += ["-jar", jar_path]
+        if pre_args:
+            command += shlex.split(pre_args) if isinstance(pre_args, str) else list(pre_args)
+        if target_file:
+            command.append(target_file)
+        if post_args:
+            command += shlex.split(post_args) if isinstance(post_args, str) else list(post_args)
         retcode, output = execute_command_in_dir(
-            command, exec_in_dir, verbose=verbose, prefix=" jNeuroML >>  "
+            command,
+            exec_in_dir,
+            verbose=verbose,
+            prefix=" jNeuroML >>  ",
+            capture_output=bool(
+                verbose or report_jnml_output or return_string or exit_on_fail
+            ),
         )
 
         if retcode != 0:
@@ -2420,7 +2583,7 @@ def run_jneuroml(
         if report_jnml_output:
             logger.debug(
                 "Successfully ran the following command using pyNeuroML v%s: \n    %s"
-                % (__version__, command)
+                % (__version__, _shlex_join(command))
             )
             logger.debug("Output:\n\n%s" % output)
 
@@ -2430,7 +2593,7 @@ def run_jneuroml(
     except Exception as e:
         logger.error("*** Execution of jnml has failed! ***")
         logger.error("Error:  %s" % e)
-        logger.error("*** Command: %s ***" % command)
+        logger.error("*** Command: %s ***" % _shlex_join(command))
         logger.error("Output: %s" % output)
         if exit_on_fail:
             sys.exit(UNKNOWN_ERR)
@@ -2447,9 +2610,9 @@ def run_jneuroml(
 
 # TODO: Refactorinng
 def run_jneuroml_with_realtime_output(
-    pre_args: str,
+    pre_args: typing.Union[str, typing.List[str]],
     target_file: str,
-    post_args: str,
+    post_args: typing.Union[str, typing.List[str]],
     max_memory: str = DEFAULTS["default_java_max_memory"],
     exec_in_dir: str = ".",
     verbose: bool = DEFAULTS["v"],
@@ -2460,8 +2623,8 @@ def run_jneuroml_with_realtime_output(
 
     NOTE: this has only been tested on Linux.
 
-    :param pre_args: pre-file name arguments
-    :type pre_args: list of strings
+    :param pre_args: pre-file name arguments, as a string or an argv list
+    :type pre_args: str or list(str)
     :param target_file: LEMS or NeuroML file to run jnml on
     :type target_file: str
     :param max_memory: maximum memory allowed for use by the JVM
@@ -2473,24 +2636,30 @@ def run_jneuroml_with_realtime_output(
     :param exit_on_fail: toggle whether command should exit if jnml fails
     :type exit_on_fail: bool
     """
-    if post_args and "nogui" in post_args and not os.name == "nt":
+    if isinstance(post_args, str):
+        has_nogui = bool(post_args) and "nogui" in post_args
+    else:
+        has_nogui = any("nogui" in arg for arg in post_args or [])
+    if has_nogui and not os.name == "nt":
         pre_jar = " -Djava.awt.headless=true"
     else:
         pre_jar = ""
     jar_path = get_path_to_jnml_jar()
 
-    command = ""
+    command = []  # type: typing.List[str]
     command_success = False
 
     try:
-        command = 'java -Xmx%s %s -jar  "%s" %s "%s" %s' % (
-            max_memory,
-            pre_jar,
-            jar_path,
-            pre_args,
-            target_file,
-            post_args,
-        )
+        command = ["java", f"-Xmx{max_memory}"]
+        if pre_jar:
+            command.append("-Djava.awt.headless=true")
+        command += ["-jar", jar_path]
+        if pre_args:
+            command += shlex.split(pre_args) if isinstance(pre_args, str) else list(pre_args)
+        if target_file:
+            command.append(target_file)
+        if post_args:
+            command += shlex.split(post_args) if isinstance(post_args, str) else list(post_args)
         command_success = execute_command_in_dir_with_realtime_output(
             command, exec_in_dir, verbose=verbose, prefix=" jNeuroML >>  "
         )
@@ -2499,7 +2668,7 @@ def run_jneuroml_with_realtime_output(
         raise e
     except:
         logger.error("*** Execution of jnml has failed! ***")
-        logger.error("*** Command: %s ***" % command)
+        logger.error("*** Command: %s ***" % _shlex_join(command))
         if exit_on_fail:
             sys.exit(UNKNOWN_ERR)
         else:
@@ -2509,7 +2678,7 @@ def run_jneuroml_with_realtime_output(
 
 
 def execute_command_in_dir_with_realtime_output(
-    command: str,
+    command: typing.Union[str, typing.List[str]],
     directory: str,
     verbose: bool = DEFAULTS["v"],
     prefix: str = "Output: ",
@@ -2520,8 +2689,8 @@ def execute_command_in_dir_with_realtime_output(
 
     NOTE: this has only been tested on Linux.
 
-    :param command: command to run
-    :type command: str
+    :param command: command to run, either as a single string or an argv list
+    :type command: str or list(str)
     :param directory: directory to run command in
     :type directory: str
     :param verbose: toggle verbose output
@@ -2534,6 +2703,9 @@ def execute_command_in_dir_with_realtime_output(
     if os.name == "nt":
         directory = os.path.normpath(directory)
 
+    if not isinstance(command, str):
+        command = _shlex_join(command)
+
     print("####################################################################")
     print("# pyNeuroML executing: (%s) in directory: %s" % (command, directory))
     if env is not None:
@@ -2546,14 +2718,24 @@ def execute_command_in_dir_with_realtime_output(
             shlex.split(command),
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            bufsize=1,
             cwd=directory,
             env=env,
-            universal_newlines=True,
         )
+        # read the pipe in large chunks and split lines in batches: a
+        # readline-per-line loop re-enters the interpreter for every line,
+        # which adds up for simulators that log thousands of them
         with p.stdout:
-            for line in iter(p.stdout.readline, ""):
-                print("# %s" % line.strip())
+            tail = b""
+            while True:
+                chunk = p.stdout.read1(65536)
+                if not chunk:
+                    break
+                lines = (tail + chunk).split(b"\n")
+                tail = lines.pop()
+                for line in lines:
+                    print("# %s" % line.decode(errors="replace").strip())
+            if tail:
+                print("# %s" % tail.decode(errors="replace").strip())
         p.wait()  # wait for the subprocess to exit
 
         print("####################################################################")
@@ -2562,12 +2744,11 @@ def execute_command_in_dir_with_realtime_output(
         if p:
             p.kill()
         raise e
-    except Exception as e:
-        print("# Exception occured: %s" % (e))
-        print("# More...")
-        print(traceback.format_exc())
-        print("####################################################################")
-        raise e
+    except Exception:
+        # logger.exception attaches the traceback only when a handler
+        # actually emits the record
+        logger.exception("Command failed: %s" % command)
+        raise
 
     if not p.returncode == 0:
         logger.critical(
@@ -2579,16 +2760,20 @@ def execute_command_in_dir_with_realtime_output(
 
 
 def execute_command_in_dir(
-    command: str,
+    command: typing.Union[str, typing.List[str]],
     directory: str,
     verbose: bool = DEFAULTS["v"],
     prefix: str = "Output: ",
     env: typing.Any = None,
+    capture_output: bool = True,
 ) -> tuple[int, str]:
     """Execute a command in specific working directory
 
-    :param command: command to run
-    :type command: str
+    An argv list runs directly without an intermediate shell process; a
+    single string is run through the shell as before.
+
+    :param command: command to run, either as a single string or an argv list
+    :type command: str or list(str)
     :param directory: directory to run command in
     :type directory: str
     :param verbose: toggle verbose output
@@ -2597,32 +2782,74 @@ def execute_command_in_dir(
     :type prefix: str
     :param env: environment variables to be used
     :type env: str
+    :param capture_output: toggle whether the command output is captured and
+        returned; when False it is spooled to a temporary file instead of a
+        pipe, the returned string is empty on success, and the output is
+        logged and returned only if the command fails
+    :type capture_output: bool
     """
     return_string = ""  # type: typing.Union[bytes, str]
     if os.name == "nt":
         directory = os.path.normpath(directory)
 
-    logger.info("Executing: (%s) in directory: %s" % (command, directory))
+    use_shell = isinstance(command, str)
+    logger.info(
+        "Executing: (%s) in directory: %s"
+        % (command if use_shell else _shlex_join(command), directory)
+    )
     if env is not None:
         logger.debug("Extra env variables %s" % (env))
 
+    if not capture_output:
+        # no caller will read the output on success, so spool it to a
+        # temporary file rather than buffering it all through a pipe into a
+        # string; if the command fails, read it back so the diagnostics are
+        # still logged
+        with tempfile.TemporaryFile() as outfile:
+            retcode = subprocess.call(
+                command,
+                cwd=directory,
+                shell=use_shell,
+                stdout=outfile,
+                stderr=subprocess.STDOUT,
+                env=env,
+                close_fds=os.name != "nt",
+            )
+            if retcode != 0:
+                outfile.seek(0)
+                output = outfile.read().decode("utf-8", errors="replace")
+                logger.critical("*** Problem running command (return code: %s)" % retcode)
+                logger.critical("%s%s" % (prefix, output.replace("\n", "\n" + prefix)))
+                return (retcode, output)
+        return (retcode, "")
+
     try:
+        # text mode decodes in the TextIOWrapper's C path, saving a full
+        # bytes -> str copy of the output
         if os.name == "nt":
             return_string = subprocess.check_output(
-                command, cwd=directory, shell=True, env=env, close_fds=False
+                command,
+                cwd=directory,
+                shell=use_shell,
+                env=env,
+                close_fds=False,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
             )
         else:
             return_string = subprocess.check_output(
                 command,
                 cwd=directory,
-                shell=True,
+                shell=use_shell,
                 stderr=subprocess.STDOUT,
                 env=env,
                 close_fds=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
             )
 
-        return_string = return_string.decode("utf-8")  # For Python 3
-
         logger.info("Command completed successfully!")
         if verbose:
             logger.info(
@@ -2631,21 +2858,10 @@ def execute_command_in_dir(
             )
         return (0, return_string)
 
-    except AttributeError:
-        # For python 2.6...
-        logger.warning("Assuming Python 2.6...")
-
-        return_string = subprocess.Popen(
-            command, cwd=directory, shell=True, stdout=subprocess.PIPE
-        ).communicate()[0]
-        return return_string.decode("utf-8")
-
     except subprocess.CalledProcessError as e:
         logger.critical("*** Problem running command: \n       %s" % e)
-        logger.critical(
-            "%s%s" % (prefix, e.output.decode().replace("\n", "\n" + prefix))
-        )
-        return (e.returncode, e.output.decode())
+        logger.critical("%s%s" % (prefix, e.output.replace("\n", "\n" + prefix)))
+        return (e.returncode, e.output)
     except Exception as e:
         logger.critical("*** Unknown problem running command: %s" % e)
         return (-1, str(e))
@@ -138,79 +138,70 @@ class NeuroMLController:
                 t, v = self.run_individual(sim_var)
                 traces.append([t, v])
         else:
-            import pp
+            import concurrent.futures
 
-            ppservers = ()
-            job_server = pp.Server(self.num_parallel_evaluations, ppservers=ppservers)
             logger.info(
                 "Running %i candidates across %i local processes"
-                % (len(candidates), job_server.get_ncpus())
+                % (len(candidates), self.num_parallel_evaluations)
             )
-            jobs = []
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.num_parallel_evaluations
+            ) as executor:
+                futures = {}
+
+                for candidate_i in range(len(candidates)):
+                    candidate = candidates[candidate_i]
+                    sim_var = dict(zip(parameters, candidate))
+                    print_v(
+                        "\n\n  - PARALLEL RUN %i (%i/%i of curr candidates); variables: %s\n"
+                        % (self.count, candidate_i + 1, len(candidates), sim_var)
+                    )
+                    self.count += 1
+                    cand_dir = self.generate_dir + "/CANDIDATE_%s" % candidate_i
+                    if not os.path.exists(cand_dir):
+                        os.mkdir(cand_dir)
+                    # We do not pass the nml_doc here because it now uses
+                    # lxml.etree, which unfortunately cannot be pickled.  Instead
+                    # we pass it as a StringIO object, and let the run_simulation
+                    # method read this in to create the nml_doc.  It is perhaps
+                    # less efficient because the nml_doc needs to be created each
+                    # time, but this is the only way it will work at the moment.
+                    nml_doc_text = StringIO()
+                    neuroml.writers.NeuroMLWriter.write(
+                        self.nml_doc, nml_doc_text, close=False
+                    )
 
-            for candidate_i in range(len(candidates)):
-                candidate = candidates[candidate_i]
-                sim_var = dict(zip(parameters, candidate))
-                print_v(
-                    "\n\n  - PARALLEL RUN %i (%i/%i of curr candidates); variables: %s\n"
-                    % (self.count, candidate_i + 1, len(candidates), sim_var)
-                )
-                self.count += 1
-                cand_dir = self.generate_dir + "/CANDIDATE_%s" % candidate_i
-                if not os.path.exists(cand_dir):
-                    os.mkdir(cand_dir)
-                # We do not pass the nml_doc here because it now uses
-                # lxml.etree, which unfortunately cannot be pickled.  Instead
-                # we pass it as a StringIO object, and let the run_simulation
-                # method read this in to create the nml_doc.  It is perhaps
-                # less efficient because the nml_doc needs to be created each
-                # time, but this is the only way it will work at the moment.
-                nml_doc_text = StringIO()
-                neuroml.writers.NeuroMLWriter.write(
-                    self.nml_doc, nml_doc_text, close=False
-                )
-                vars = (
-                    sim_var,
-                    self.ref,
-                    self.neuroml_file,
-                    nml_doc_text.getvalue(),
-                    self.still_included,
-                    cand_dir,
-                    self.target,
-                    self.sim_time,
-                    self.dt,
-                    self.simulator,
-                )
+                    future = executor.submit(
+                        run_individual,
+                        sim_var,
+                        self.ref,
+                        self.neuroml_file,
+                        nml_doc_text.getvalue(),
+                        self.still_included,
+                        cand_dir,
+                        self.target,
+                        self.sim_time,
+                        self.dt,
+                        self.simulator,
+                    )
+                    futures[future] = candidate_i
+                    nml_doc_text.close()
+
+                # reap each simulation as soon as it finishes rather than
+                # blocking until the whole batch is done; traces stays in
+                # candidate order
+                results = [None] * len(futures)  # type: list
+                for future in concurrent.futures.as_completed(futures):
+                    candidate_i = futures[future]
+                    logger.info(
+                        "Parallel job for candidate %i/%i finished"
+                        % (candidate_i + 1, len(futures))
+                    )
+                    results[candidate_i] = future.result()
 
-                job = job_server.submit(
-                    run_individual,
-                    vars,
-                    (),
-                    (
-                        "pyneuroml",
-                        "pyneuroml.pynml",
-                        "pyneuroml.tune.NeuroMLSimulation",
-                        "shutil",
-                        "neuroml",
-                        "logging",
-                    ),
-                )
-                jobs.append(job)
-                nml_doc_text.close()
-
-            for job_i in range(len(jobs)):
-                job = jobs[job_i]
-                logger.info(
-                    "Checking parallel job %i/%i; set running so far: %i"
-                    % (job_i, len(jobs), self.count)
-                )
-                t, v = job()
+            for t, v in results:
                 traces.append([t, v])
 
-                # logger.info("Obtained: %s"%result)
-
-            # job_server.print_stats()
-            job_server.destroy()
             print("-------------------------------------------")
 
         end_time = time.time()
@@ -239,7 +230,8 @@ class NeuroMLController:
         )
 
 
-# This needs to be a separate function for the ppft job server
+# This must stay a module-level function so that ProcessPoolExecutor can
+# pickle it when submitting jobs to the worker processes
 def run_individual(
     sim_var,
     reference,
@@ -7,7 +7,9 @@ File: pyneuroml/utils/plot.py
 Copyright 2023 NeuroML contributors
 """
 
+import functools
 import logging
+import math
 import os
 import random
 import typing
@@ -15,6 +17,7 @@ import typing
 import matplotlib
 import numpy
 from matplotlib import pyplot as plt
+from matplotlib.collections import LineCollection
 from matplotlib.lines import Line2D
 from matplotlib.patches import Rectangle
 from matplotlib_scalebar.scalebar import ScaleBar
@@ -148,30 +151,31 @@ def get_new_matplotlib_morph_plot(
     ax.yaxis.set_ticks_position("left")
     ax.xaxis.set_ticks_position("bottom")
 
-    if plane2d == "xy":
-        ax.set_xlabel("x (μm)")
-        ax.set_ylabel("y (μm)")
-    elif plane2d == "yx":
-        ax.set_xlabel("y (μm)")
-        ax.set_ylabel("x (μm)")
-    elif plane2d == "xz":
-        ax.set_xlabel("x (μm)")
-        ax.set_ylabel("z (μm)")
-    elif plane2d == "zx":
-        ax.set_xlabel("z (μm)")
-        ax.set_ylabel("x (μm)")
-    elif plane2d == "yz":
-        ax.set_xlabel("y (μm)")
-        ax.set_ylabel("z (μm)")
-    elif plane2d == "zy":
-        ax.set_xlabel("z (μm)")
-        ax.set_ylabel("y (μm)")
-    else:
+    if plane2d not in PLANE_TO_COLUMN_INDICES:
         raise ValueError(f"Invalid value for plane: {plane2d}")
 
+    ax.set_xlabel(f"{plane2d[0]} (μm)")
+    ax.set_ylabel(f"{plane2d[1]} (μm)")
+
     return fig, ax
 
 
+def _data_to_points_scale(axes: matplotlib.axes.Axes) -> float:
+    """Get the scale factor from y data units to points for an axes.
+
+    Computed analytically from the axes geometry: this is much cheaper than
+    round-tripping through ``axes.transData.transform``, which matters when it
+    is evaluated per artist per draw.
+
+    :param axes: axes to compute the scale factor for
+    :type axes: matplotlib.axes.Axes
+    :returns: multiplier converting a y extent in data units to points
+    """
+    ppd = 72.0 / axes.figure.dpi
+    ymin, ymax = axes.get_ylim()
+    return axes.bbox.height / (ymax - ymin) * ppd
+
+
 class LineDataUnits(Line2D):
     """New Line class for making lines with specific widthS
 
@@ -186,9 +190,7 @@ class LineDataUnits(Line2D):
 
     def _get_lw(self):
         if self.axes is not None:
-            ppd = 72.0 / self.axes.figure.dpi
-            trans = self.axes.transData.transform
-            return ((trans((1, self._lw_data)) - trans((0, 0))) * ppd)[1]
+            return self._lw_data * _data_to_points_scale(self.axes)
         else:
             return 1
 
@@ -198,6 +200,235 @@ class LineDataUnits(Line2D):
     _linewidth = property(_get_lw, _set_lw)
 
 
+# columns of the (N, 8) segment array ([px, py, pz, pd, dx, dy, dz, dd])
+# holding the proximal/distal coordinates for each 2D plane
+PLANE_TO_COLUMN_INDICES = {
+    "xy": (0, 1),
+    "yx": (1, 0),
+    "xz": (0, 2),
+    "zx": (2, 0),
+    "yz": (1, 2),
+    "zy": (2, 1),
+}  # type: typing.Dict[str, typing.Tuple[int, int]]
+
+
+def get_segment_group_sets(
+    cell: Cell,
+) -> typing.Tuple[
+    typing.FrozenSet[int], typing.FrozenSet[int], typing.FrozenSet[int]
+]:
+    """Get the ids of the segments in the default soma, dendrite, and axon
+    groups of a cell as frozensets.
+
+    Plotting functions use these for membership tests when colouring
+    segments; sets make those tests O(1) instead of scanning lists, and the
+    result is cached on the cell object so the groups are only resolved once
+    per cell, not once per plotted cell instance.
+
+    :param cell: cell to get segment groups for
+    :type cell: neuroml.Cell
+    :returns: tuple of (soma, dendrite, axon) segment id frozensets; groups
+        that the cell does not define are empty
+    """
+    try:
+        return cell._seg_group_sets
+    except AttributeError:
+        pass
+
+    group_sets = []
+    for group in ("soma_group", "dendrite_group", "axon_group"):
+        try:
+            group_sets.append(frozenset(cell.get_all_segments_in_group(group)))
+        except Exception:
+            group_sets.append(frozenset())
+
+    cell._seg_group_sets = tuple(group_sets)
+    return cell._seg_group_sets
+
+
+def get_actual_proximals(cell: Cell) -> typing.Dict[int, typing.Any]:
+    """Get the actual proximal points of all segments of a cell.
+
+    `Cell.get_actual_proximal` resolves each segment's proximal point by
+    walking up to the parent segment when the proximal point is not set
+    explicitly, and it looks the segment up in the segment list on each call.
+    Plotting functions call it for every segment, possibly many times for the
+    same cell (for example for each instance of the cell in a network), so the
+    results are computed once here and cached on the cell object.
+
+    :param cell: cell to get proximal points for
+    :type cell: neuroml.Cell
+    :returns: dict mapping segment ids to their (actual) proximal points
+    """
+    try:
+        return cell._proximal_cache
+    except AttributeError:
+        pass
+
+    proximals = {}
+    for seg in cell.morphology.segments:
+        if seg.proximal is not None:
+            proximals[seg.id] = seg.proximal
+        else:
+            proximals[seg.id] = cell.get_actual_proximal(seg.id)
+
+    cell._proximal_cache = proximals
+    return proximals
+
+
+def get_cell_segments_array(cell: Cell) -> numpy.ndarray:
+    """Get the geometry of all segments of a cell as a numpy array.
+
+    Walks the segments of the cell once and assembles an (N, 8) float array
+    with one row per segment: [px, py, pz, pdiam, dx, dy, dz, ddiam], where p
+    is the (actual) proximal point and d the distal point. The rows are in the
+    order of `cell.morphology.segments`.
+
+    Plotting functions use this to vectorise their per-segment computations
+    with numpy instead of accessing attributes of each segment object in
+    Python loops.
+
+    The array is cached on the cell object, so repeated calls (for example
+    when plotting the same cell at multiple positions in a network) do not
+    recompute it.
+
+    :param cell: cell to get segment geometry for
+    :type cell: neuroml.Cell
+    :returns: (N, 8) numpy array of segment geometries
+    """
+    try:
+        return cell._seg_xyzd_cache
+    except AttributeError:
+        pass
+
+    proximals = get_actual_proximals(cell)
+    segments = cell.morphology.segments
+    # float32 is plenty for plotting and halves the memory/bandwidth of
+    # everything derived from this array
+    seg_arr = numpy.empty((len(segments), 8), dtype=numpy.float32)
+    for i, seg in enumerate(segments):
+        p = proximals[seg.id]
+        d = seg.distal
+        seg_arr[i] = (p.x, p.y, p.z, p.diameter, d.x, d.y, d.z, d.diameter)
+
+    cell._seg_xyzd_cache = seg_arr
+    return seg_arr
+
+
+def classify_segments(
+    seg_arr: numpy.ndarray, min_width: float
+) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+    """Compute per-segment widths and spherical masks for all segments at once.
+
+    Vectorised replacement for the scalar per-segment arithmetic (width
+    averaging, minimum width clamping, spherical detection) that plotting
+    functions previously did inside Python loops.
+
+    :param seg_arr: (N, 8) segment geometry array from
+        :py:func:`get_cell_segments_array`
+    :type seg_arr: numpy.ndarray
+    :param min_width: minimum width for segments
+    :type min_width: float
+    :returns: tuple of (widths, spherical) arrays: widths is the (N,) array of
+        mean segment diameters clamped to min_width, spherical the (N,)
+        boolean array marking segments whose proximal and distal points (and
+        diameters) coincide
+    """
+    widths = numpy.maximum((seg_arr[:, 3] + seg_arr[:, 7]) / 2.0, min_width)
+    spherical = (seg_arr[:, 0:4] == seg_arr[:, 4:8]).all(axis=1)
+    return widths, spherical
+
+
+class LineDataUnitsCollection(LineCollection):
+    """Variant of :py:class:`matplotlib.collections.LineCollection` with line
+    widths given in data units.
+
+    This is the vectorised analogue of :py:class:`LineDataUnits`: the data to
+    display unit scale factor is computed once per draw for the whole
+    collection, instead of once per line per draw.
+    """
+
+    def __init__(self, segments, linewidths=1, **kwargs):
+        super().__init__(segments, **kwargs)
+        self._lw_data = numpy.atleast_1d(numpy.asarray(linewidths, dtype=float))
+        self._lw_scale = None  # type: typing.Optional[float]
+
+    def draw(self, renderer):
+        if self.axes is not None:
+            scale = _data_to_points_scale(self.axes)
+            # only rescale the widths when the transform has changed (e.g. on
+            # zoom/resize); redraws at the same scale reuse the stored widths
+            if scale != self._lw_scale:
+                self.set_linewidth(self._lw_data * scale)
+                self._lw_scale = scale
+        super().draw(renderer)
+
+
+def add_lines_to_matplotlib_2D_plot(
+    ax: matplotlib.axes.Axes,
+    segments,
+    widths,
+    colors,
+    axis_min_max: typing.List,
+):
+    """Add a batch of lines to a matplotlib plot as a single collection.
+
+    This is much faster than calling
+    :py:func:`add_line_to_matplotlib_2D_plot` once per line, which creates one
+    matplotlib artist per line.
+
+    Lines of (near) zero length, which are spheres/cylinders seen from the
+    top, are drawn as circles in a second, round-capped collection.
+
+    :param ax: matplotlib.axes.Axes object
+    :type ax: matplotlib.axes.Axes
+    :param segments: list/array of line endpoint pairs: [[(x0, y0), (x1, y1)], ...]
+    :type segments: list or numpy.ndarray of shape (N, 2, 2)
+    :param widths: width of each line, in data units
+    :type widths: list or numpy.ndarray of shape (N,)
+    :param colors: color of each line
+    :type colors: list of color specifications, or numpy.ndarray of RGBA rows
+    :param axis_min_max: min, max value of axis, updated in place
+    :type axis_min_max: [float, float]
+    """
+    # convert once, up front: passing a contiguous (N, 2, 2) ndarray to
+    # LineCollection makes its own conversion of the segment list a no-op
+    segment_arr = numpy.ascontiguousarray(segments, dtype=numpy.float32)
+    width_arr = numpy.asarray(widths, dtype=float)
+
+    # near zero-length lines: cylinders viewed from the top, or spheres: draw
+    # circles using round caps
+    spherical = (
+        numpy.abs(segment_arr[:, 0, :] - segment_arr[:, 1, :]) < 0.01
+    ).all(axis=1)
+    if spherical.any():
+        sph_segments = segment_arr[spherical].copy()
+        sph_segments[:, 1, :] += (width_arr[spherical] / 1000.0)[:, numpy.newaxis]
+        sph_colors = (
+            colors[spherical]
+            if isinstance(colors, numpy.ndarray)
+            else [c for c, s in zip(colors, spherical) if s]
+        )
+        ax.add_collection(
+            LineDataUnitsCollection(
+                sph_segments,
+                linewidths=width_arr[spherical],
+                colors=sph_colors,
+                capstyle="round",
+            )
+        )
+
+    ax.add_collection(
+        LineDataUnitsCollection(
+            segment_arr, linewidths=width_arr, colors=colors, capstyle="butt"
+        )
+    )
+
+    xs = segment_arr[:, :, 0]
+    axis_min_max[0] = min(axis_min_max[0], float(numpy.min(xs)))
+    axis_min_max[1] = max(axis_min_max[1], float(numpy.max(xs)))
+
+
 def autoscale_matplotlib_plot(verbose: bool = False, square: bool = True) -> None:
     """Autoscale the current matplotlib plot
 
@@ -303,10 +534,467 @@ def add_line_to_matplotlib_2D_plot(ax, xv, yv, width, color, axis_min_max):
         LineDataUnits(xv, yv, linewidth=width, solid_capstyle="butt", color=color)
     )
 
-    axis_min_max[0] = min(axis_min_max[0], xv[0])
-    axis_min_max[0] = min(axis_min_max[0], xv[1])
-    axis_min_max[1] = max(axis_min_max[1], xv[0])
-    axis_min_max[1] = max(axis_min_max[1], xv[1])
+    axis_min_max[0] = min(axis_min_max[0], xv[0], xv[1])
+    axis_min_max[1] = max(axis_min_max[1], xv[0], xv[1])
+
+
+@functools.lru_cache(maxsize=8)
+def _unit_sphere_mesh(
+    resolution: int,
+) -> typing.Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """Get the coordinate grids of a unit sphere centered on the origin.
+
+    All spheres are scaled/translated copies of this mesh, so it only needs
+    to be generated (and its trigonometric tables evaluated) once per
+    resolution.
+
+    :param resolution: resolution of the mesh grid
+    :type resolution: int
+    :returns: (X, Y, Z) coordinate grids of the unit sphere surface
+    """
+    u, v = numpy.mgrid[
+        0 : 2 * numpy.pi : resolution * 2j, 0 : numpy.pi : resolution * 1j  # noqa
+    ]
+    return (
+        numpy.cos(u) * numpy.sin(v),
+        numpy.sin(u) * numpy.sin(v),
+        numpy.cos(v),
+    )
+
+
+def get_sphere_surface(
+    x: typing.Union[float, numpy.ndarray],
+    y: typing.Union[float, numpy.ndarray],
+    z: typing.Union[float, numpy.ndarray],
+    radius: typing.Union[float, numpy.ndarray],
+    resolution: int = 20,
+) -> typing.Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """Get the surfaces of one or more spheres as coordinate grids.
+
+    The centers and radii may be scalars, giving one (A, B) surface grid per
+    coordinate, or (N,) arrays, giving (N, A, B) stacked grids with one
+    surface per sphere. The unit sphere mesh is cached per resolution, so
+    each call only scales and translates it.
+
+    :param x: x coordinate(s) of center(s)
+    :type x: float or numpy.ndarray
+    :param y: y coordinate(s) of center(s)
+    :type y: float or numpy.ndarray
+    :param z: z coordinate(s) of center(s)
+    :type z: float or numpy.ndarray
+    :param radius: radius/radii of sphere(s)
+    :type radius: float or numpy.ndarray
+    :param resolution: resolution of the mesh grid
+    :type resolution: int
+    :returns: (X, Y, Z) coordinate grids of the surface(s)
+    """
+    ux, uy, uz = _unit_sphere_mesh(resolution)
+    radius = numpy.asarray(radius)[..., numpy.newaxis, numpy.newaxis]
+    X = radius * ux + numpy.asarray(x)[..., numpy.newaxis, numpy.newaxis]
+    Y = radius * uy + numpy.asarray(y)[..., numpy.newaxis, numpy.newaxis]
+    Z = radius * uz + numpy.asarray(z)[..., numpy.newaxis, numpy.newaxis]
+    return X, Y, Z
+
+
+@functools.lru_cache(maxsize=16)
+def _theta_trig(
+    angular_resolution: int,
+) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+    """Get cached sin/cos tables for the frustrum circumference angles.
+
+    The tables are identical for every segment of a plot, so they are cached
+    per angular resolution and returned as read-only
+    (angular_resolution, 1) column vectors.
+
+    :param angular_resolution: number of points around the circumference
+    :type angular_resolution: int
+    :returns: (sin(theta), cos(theta)) column vectors
+    """
+    if angular_resolution >= 8:
+        # for finer tables, generate the samples from the two seed values
+        # with the Chebyshev recurrence instead of evaluating sin/cos at
+        # every angle
+        dtheta = 2 * numpy.pi / (angular_resolution - 1)
+        sin_theta = numpy.empty((angular_resolution, 1))
+        cos_theta = numpy.empty((angular_resolution, 1))
+        sin_theta[0], cos_theta[0] = 0.0, 1.0
+        sin_theta[1], cos_theta[1] = math.sin(dtheta), math.cos(dtheta)
+        k = 2 * cos_theta[1, 0]
+        for i in range(2, angular_resolution):
+            sin_theta[i] = k * sin_theta[i - 1] - sin_theta[i - 2]
+            cos_theta[i] = k * cos_theta[i - 1] - cos_theta[i - 2]
+    else:
+        theta = numpy.linspace(0, 2 * numpy.pi, angular_resolution)[
+            :, numpy.newaxis
+        ]
+        sin_theta = numpy.sin(theta)
+        cos_theta = numpy.cos(theta)
+    sin_theta = sin_theta.astype(numpy.float32)
+    cos_theta = cos_theta.astype(numpy.float32)
+    sin_theta.setflags(write=False)
+    cos_theta.setflags(write=False)
+    return sin_theta, cos_theta
+
+
+@functools.lru_cache(maxsize=16)
+def _unit_linspace(resolution: int) -> numpy.ndarray:
+    """Get a cached read-only (1, resolution) row vector of points in [0, 1].
+
+    Scaled by the axis length/radii per call, this replaces per-call
+    linspace allocations.
+
+    :param resolution: number of points
+    :type resolution: int
+    :returns: row vector of evenly spaced points from 0 to 1
+    """
+    unit = numpy.linspace(0.0, 1.0, resolution, dtype=numpy.float32)[
+        numpy.newaxis, :
+    ]
+    unit.setflags(write=False)
+    return unit
+
+
+@functools.lru_cache(maxsize=1024)
+def _basis_for_axis(
+    aux: float, auy: float, auz: float
+) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+    """Get a cached pair of unit vectors perpendicular to the given unit axis.
+
+    Consecutive segments along an unbranched neurite section share their
+    direction, so caching the basis (keyed on the rounded unit axis) skips
+    the cross products and norms for most segments of a morphology.
+
+    :param aux: x component of the unit axis vector
+    :type aux: float
+    :param auy: y component of the unit axis vector
+    :type auy: float
+    :param auz: z component of the unit axis vector
+    :type auz: float
+    :returns: (perp1, perp2) read-only perpendicular unit vectors
+    """
+    # to get a vector perpendicular to the axis vector, cross it with some
+    # vector that is not parallel to it: use the y axis when the axis is
+    # (nearly) parallel to the x axis, in either direction, and the x axis
+    # otherwise, so the cross product can never be (close to) zero length
+    if abs(aux) > 0.9:
+        sx, sy, sz = (0.0, 1.0, 0.0)
+    else:
+        sx, sy, sz = (1.0, 0.0, 0.0)
+
+    p1x = auy * sz - auz * sy
+    p1y = auz * sx - aux * sz
+    p1z = aux * sy - auy * sx
+    p1_mag = math.sqrt(p1x * p1x + p1y * p1y + p1z * p1z)
+    p1x, p1y, p1z = p1x / p1_mag, p1y / p1_mag, p1z / p1_mag
+
+    perp1_unit = numpy.array([p1x, p1y, p1z], dtype=numpy.float32)
+    perp2_unit = numpy.array(
+        [auy * p1z - auz * p1y, auz * p1x - aux * p1z, aux * p1y - auy * p1x],
+        dtype=numpy.float32,
+    )
+    perp1_unit.setflags(write=False)
+    perp2_unit.setflags(write=False)
+    return perp1_unit, perp2_unit
+
+
+def get_frustrum_surface(
+    x1: float,
+    y1: float,
+    z1: float,
+    radius1: float,
+    x2: float,
+    y2: float,
+    z2: float,
+    radius2: typing.Optional[float] = None,
+    capped: bool = False,
+    resolution: int = 3,
+    angular_resolution: int = 4,
+) -> typing.List[typing.Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]:
+    """Get the surface of a frustrum (a cylinder if the two radii are equal)
+    between two points.
+
+    Reference: https://stackoverflow.com/a/32383775
+
+    :param x1: x coordinate of proximal point
+    :type x1: float
+    :param y1: y coordinate of proximal point
+    :type y1: float
+    :param z1: z coordinate of proximal point
+    :type z1: float
+    :param radius1: radius at proximal point
+    :type radius1: float
+    :param x2: x coordinate of distal point
+    :type x2: float
+    :param y2: y coordinate of distal point
+    :type y2: float
+    :param z2: z coordinate of distal point
+    :type z2: float
+    :param radius2: radius at distal point (defaults to radius1, giving a
+        cylinder)
+    :type radius2: float
+    :param capped: whether cap surfaces should also be generated for the two
+        ends
+    :type capped: bool
+    :param resolution: number of points along the axis
+    :type resolution: int
+    :param angular_resolution: number of points around the circumference
+    :type angular_resolution: int
+    :returns: list of (X, Y, Z) float32 coordinate grids: the lateral
+        surface, followed by the two cap surfaces if `capped` is True; single
+        precision is ample for plotting geometry and halves the memory the
+        plotting backends need to move
+    """
+    # coerce to plain Python floats once: callers often pass numpy scalars
+    # (rows of a segment array), and the scalar arithmetic below is cheaper
+    # on unboxed floats
+    x1, y1, z1, x2, y2, z2 = (
+        float(x1), float(y1), float(z1), float(x2), float(y2), float(z2),
+    )
+    radius1 = float(radius1)
+    radius2 = radius1 if radius2 is None else float(radius2)
+
+    # the norms and cross products below are on 3-vectors only: scalar
+    # arithmetic is much cheaper than the numpy.linalg.norm/numpy.cross calls
+    # when this runs once per segment
+    ax, ay, az = x2 - x1, y2 - y1, z2 - z1
+    axis_mag = math.sqrt(ax * ax + ay * ay + az * az)
+    aux, auy, auz = ax / axis_mag, ay / axis_mag, az / axis_mag
+
+    axis_unit_vector = numpy.array([aux, auy, auz], dtype=numpy.float32)
+    # consecutive segments of an unbranched neurite usually share the same
+    # direction, so the perpendicular basis is cached keyed on the rounded
+    # unit axis
+    perp1_unit, perp2_unit = _basis_for_axis(
+        round(aux, 6), round(auy, 6), round(auz, 6)
+    )
+    # deferred formatting: only stringified if DEBUG logging is enabled
+    logger.debug(
+        "Frustrum basis: %s, %s, %s", axis_unit_vector, perp1_unit, perp2_unit
+    )
+
+    # sparse broadcasting: keep t/r as row vectors and theta as a column
+    # vector, and let the X/Y/Z expressions broadcast them to the full
+    # (angular_resolution, resolution) grids, instead of materialising the
+    # grids with meshgrid and evaluating sin/cos over whole grids; the theta
+    # trig tables and the unit parameter vector are identical for every
+    # segment of a plot, so they are cached across calls
+    unit = _unit_linspace(resolution)
+    t = axis_mag * unit
+    sin_theta, cos_theta = _theta_trig(angular_resolution)
+
+    # r*sin(theta) and r*cos(theta) are shared between the X/Y/Z expressions:
+    # compute them once instead of once per axis
+    if radius1 == radius2:
+        # most neurite segments are cylinders: r is constant along the axis,
+        # so the radial products collapse to (A, 1) columns that broadcast
+        # over the resolution axis
+        rs = radius1 * sin_theta
+        rc = radius1 * cos_theta
+    else:
+        r = radius1 + (radius2 - radius1) * unit
+        rs = r * sin_theta
+        rc = r * cos_theta
+
+    # evaluate all three axes in one (3, angular_resolution, resolution)
+    # broadcast expression: the shared rs/rc buffers are traversed once
+    # instead of once per axis
+    p = numpy.array([x1, y1, z1], dtype=numpy.float32)[
+        :, numpy.newaxis, numpy.newaxis
+    ]
+    au = axis_unit_vector[:, numpy.newaxis, numpy.newaxis]
+    u1 = perp1_unit[:, numpy.newaxis, numpy.newaxis]
+    u2 = perp2_unit[:, numpy.newaxis, numpy.newaxis]
+
+    # fill a preallocated output with in-place operations, reusing one
+    # scratch buffer, instead of allocating a fresh temporary for every
+    # binary operation in the expression
+    shape = (3, sin_theta.shape[0], t.shape[1])
+    XYZ = numpy.empty(shape, dtype=numpy.float32)
+    tmp = numpy.empty(shape, dtype=numpy.float32)
+    numpy.multiply(au, t, out=XYZ)
+    XYZ += p
+    numpy.multiply(u1, rs, out=tmp)
+    XYZ += tmp
+    numpy.multiply(u2, rc, out=tmp)
+    XYZ += tmp
+    surfaces = [(XYZ[0], XYZ[1], XYZ[2])]
+
+    if capped:
+        # each cap grid has only two radial points: the centre of the end
+        # disc and its rim, so the two columns are filled directly from the
+        # shared rim direction vectors instead of via another r grid
+        rim = u1 * sin_theta + u2 * cos_theta  # (3, angular_resolution, 1)
+        for radius, displacement in ((radius1, 0.0), (radius2, axis_mag)):
+            center = p + au * displacement  # (3, 1, 1)
+            cap = numpy.empty(
+                (3, sin_theta.shape[0], 2), dtype=numpy.float32
+            )
+            cap[:, :, 0] = center[:, :, 0]
+            cap[:, :, 1] = (center + radius * rim)[:, :, 0]
+            surfaces.append((cap[0], cap[1], cap[2]))
+
+    return surfaces
+
+
+def get_frustrum_surfaces(
+    p1: numpy.ndarray,
+    p2: numpy.ndarray,
+    radius1: numpy.ndarray,
+    radius2: typing.Optional[numpy.ndarray] = None,
+    capped: bool = False,
+    resolution: int = 3,
+    angular_resolution: int = 4,
+) -> typing.List[typing.Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]:
+    """Get the surfaces of a batch of frustrums between pairs of points.
+
+    Batched version of :py:func:`get_frustrum_surface`: all N frustrums are
+    computed with broadcast array operations in one pass, which is much
+    faster than N single-frustrum calls when generating the surfaces of all
+    segments of a cell.
+
+    :param p1: (N, 3) array of proximal points
+    :type p1: numpy.ndarray
+    :param p2: (N, 3) array of distal points
+    :type p2: numpy.ndarray
+    :param radius1: (N,) array of radii at the proximal points
+    :type radius1: numpy.ndarray
+    :param radius2: (N,) array of radii at the distal points (defaults to
+        radius1, giving cylinders)
+    :type radius2: numpy.ndarray
+    :param capped: whether cap surfaces should also be generated for the two
+        ends
+    :type capped: bool
+    :param resolution: number of points along the axis
+    :type resolution: int
+    :param angular_resolution: number of points around the circumference
+    :type angular_resolution: int
+    :returns: list of (X, Y, Z) stacked float32 coordinate grids, each of
+        shape (N, angular_resolution, resolution): the lateral surfaces,
+        followed by the two (N, angular_resolution, 2) cap grids if `capped`
+        is True
+    """
+    p1 = numpy.asarray(p1, dtype=numpy.float32)
+    p2 = numpy.asarray(p2, dtype=numpy.float32)
+    radius1 = numpy.asarray(radius1, dtype=numpy.float32)
+    radius2 = (
+        radius1
+        if radius2 is None
+        else numpy.asarray(radius2, dtype=numpy.float32)
+    )
+
+    axis = p2 - p1
+    axis_mag = numpy.linalg.norm(axis, axis=1, keepdims=True)
+    axis_u = axis / axis_mag
+
+    # per-row choice of a vector that is not (near) parallel to the axis, to
+    # cross with it for the perpendicular basis
+    somev = numpy.zeros_like(axis_u)
+    use_y = numpy.abs(axis_u[:, 0]) > 0.9
+    somev[use_y, 1] = 1.0
+    somev[~use_y, 0] = 1.0
+
+    perp1 = numpy.cross(axis_u, somev)
+    perp1 /= numpy.linalg.norm(perp1, axis=1, keepdims=True)
+    perp2 = numpy.cross(axis_u, perp1)
+
+    t_frac = _unit_linspace(resolution)
+    t = axis_mag[:, :, numpy.newaxis] * t_frac
+    r = (
+        radius1[:, numpy.newaxis, numpy.newaxis] * (1 - t_frac)
+        + radius2[:, numpy.newaxis, numpy.newaxis] * t_frac
+    )
+    sin_theta, cos_theta = _theta_trig(angular_resolution)
+    sin_theta = sin_theta[numpy.newaxis]
+    cos_theta = cos_theta[numpy.newaxis]
+
+    rs = r * sin_theta
+    rc = r * cos_theta
+
+    def _component(i: int) -> numpy.ndarray:
+        return (
+            p1[:, i, numpy.newaxis, numpy.newaxis]
+            + axis_u[:, i, numpy.newaxis, numpy.newaxis] * t
+            + rs * perp1[:, i, numpy.newaxis, numpy.newaxis]
+            + rc * perp2[:, i, numpy.newaxis, numpy.newaxis]
+        )
+
+    surfaces = [(_component(0), _component(1), _component(2))]
+
+    if capped:
+        for radius, displacement in (
+            (radius1, numpy.zeros_like(axis_mag)),
+            (radius2, axis_mag),
+        ):
+            r_cap = radius[:, numpy.newaxis, numpy.newaxis] * numpy.array([0.0, 1.0])
+            cap_rs = r_cap * sin_theta
+            cap_rc = r_cap * cos_theta
+            cap = []
+            for i in [0, 1, 2]:
+                cap.append(
+                    p1[:, i, numpy.newaxis, numpy.newaxis]
+                    + axis_u[:, i, numpy.newaxis, numpy.newaxis]
+                    * displacement[:, :, numpy.newaxis]
+                    + cap_rs * perp1[:, i, numpy.newaxis, numpy.newaxis]
+                    + cap_rc * perp2[:, i, numpy.newaxis, numpy.newaxis]
+                )
+            surfaces.append((cap[0], cap[1], cap[2]))
+
+    return surfaces
+
+
+def decimate_collinear_segments(
+    seg_arr: numpy.ndarray, tolerance: float
+) -> numpy.ndarray:
+    """Merge runs of near-collinear consecutive segments.
+
+    Walks an (N, 8) segment geometry array (as returned by
+    :py:func:`get_cell_segments_array`) and greedily merges each run of
+    consecutive segments where every interior joint lies within `tolerance`
+    (in um) of the chord joining the run's end points. Long straight
+    dendritic stretches, which morphology reconstructions often describe
+    with many short cylinders, collapse into single segments, which shrinks
+    both the plot payload and the draw count.
+
+    A merged row keeps the proximal point and diameter of its first segment
+    and the distal point and diameter of its last one. Only meant for line
+    plots: detailed surface renderings should keep every frustrum.
+
+    :param seg_arr: (N, 8) array of segment geometries
+    :type seg_arr: numpy.ndarray
+    :param tolerance: maximum perpendicular distance (um) of interior joints
+        from the merged chord
+    :type tolerance: float
+    :returns: (M, 8) array of merged segment geometries, M <= N
+    """
+    if len(seg_arr) < 2 or tolerance <= 0:
+        return seg_arr
+
+    merged = []
+    first = seg_arr[0]
+    joints = []  # type: typing.List[numpy.ndarray]
+
+    for row in seg_arr[1:]:
+        chord = row[4:7] - first[0:3]
+        chord_mag = math.sqrt(float(chord.dot(chord)))
+        extends = numpy.array_equal(row[0:3], first[4:7]) and chord_mag > 0
+        if extends:
+            candidate_joints = joints + [row[0:3]]
+            dists = numpy.linalg.norm(
+                numpy.cross(chord, numpy.asarray(candidate_joints) - first[0:3]),
+                axis=1,
+            ) / chord_mag
+            if dists.max() <= tolerance:
+                joints = candidate_joints
+                merged_row = first.copy()
+                merged_row[4:8] = row[4:8]
+                first = merged_row
+                continue
+        merged.append(first)
+        first = row
+        joints = []
+    merged.append(first)
+
+    return numpy.asarray(merged, dtype=seg_arr.dtype)
 
 
 def get_cell_bound_box(cell: Cell):
@@ -329,6 +1017,61 @@ def get_cell_bound_box(cell: Cell):
     return view_min, view_max
 
 
+@functools.lru_cache(maxsize=8)
+def _load_plottable_nml_model(
+    abspath: str, mtime: float, minimal: bool
+) -> NeuroMLDocument:
+    """Cached worker for :py:func:`load_plottable_nml_model`.
+
+    The modification time is part of the cache key purely to invalidate
+    cached models when the file changes on disk.
+    """
+    if not minimal:
+        return read_neuroml2_file(
+            abspath,
+            include_includes=True,
+            verbose=False,
+            optimized=True,
+        )
+
+    # load without optimization for older HDF5 API
+    # TODO: check if this is required: must for MultiscaleISN
+    if abspath.endswith(".h5"):
+        return read_neuroml2_file(abspath)
+
+    nml_model = read_neuroml2_file(
+        abspath,
+        include_includes=False,
+        verbose=False,
+        optimized=True,
+    )
+    load_minimal_morphplottable__model(nml_model, abspath)
+    return nml_model
+
+
+def load_plottable_nml_model(
+    nml_file: str, minimal: bool = True
+) -> NeuroMLDocument:
+    """Load a NeuroML model from a file for plotting, with caching.
+
+    Parsing (and validating) a NeuroML file is often the single heaviest step
+    of a plotting session, and each plotting entry point needs to do it. The
+    models loaded here are kept in a small cache keyed on the absolute path
+    and modification time of the file, so re-plotting a model or switching
+    between plotting engines does not re-parse it.
+
+    :param nml_file: path of NeuroML file to load
+    :type nml_file: str
+    :param minimal: only load the parts of the model needed for morphology
+        plotting (see :py:func:`load_minimal_morphplottable__model`); if
+        False, the model is loaded completely, with all its includes
+    :type minimal: bool
+    :returns: loaded model
+    """
+    abspath = os.path.abspath(nml_file)
+    return _load_plottable_nml_model(abspath, os.path.getmtime(abspath), minimal)
+
+
 def load_minimal_morphplottable__model(
     nml_model: NeuroMLDocument, nml_file_path: str = ""
 ):
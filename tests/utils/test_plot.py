@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test plot utils
+
+File: tests/utils/test_plot.py
+
+Copyright 2023 NeuroML contributors
+"""
+
+
+import logging
+
+import numpy
+
+from pyneuroml.utils.plot import (
+    decimate_collinear_segments,
+    get_frustrum_surface,
+    get_sphere_surface,
+)
+
+from .. import BaseTestCase
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+class TestPlotUtils(BaseTestCase):
+
+    """Test utils.plot module"""
+
+    def test_get_sphere_surface(self):
+        """Test get_sphere_surface"""
+        X, Y, Z = get_sphere_surface(1.0, 2.0, 3.0, 5.0, resolution=20)
+        self.assertEqual(X.shape, (40, 20))
+        self.assertEqual(Y.shape, (40, 20))
+        self.assertEqual(Z.shape, (40, 20))
+        # all points must lie on the sphere
+        dist = numpy.sqrt((X - 1.0) ** 2 + (Y - 2.0) ** 2 + (Z - 3.0) ** 2)
+        self.assertTrue(numpy.allclose(dist, 5.0))
+
+    def test_get_frustrum_surface(self):
+        """Test get_frustrum_surface"""
+        surfaces = get_frustrum_surface(
+            0.0, 0.0, 0.0, 2.0, 10.0, 0.0, 0.0, 1.0, capped=True
+        )
+        self.assertEqual(len(surfaces), 3)
+        X, Y, Z = surfaces[0]
+        self.assertEqual(X.shape, (4, 3))
+        # points on the lateral surface are at radius r(t) from the axis
+        self.assertTrue(numpy.allclose(numpy.sqrt(Y**2 + Z**2)[:, 0], 2.0))
+        self.assertTrue(numpy.allclose(numpy.sqrt(Y**2 + Z**2)[:, -1], 1.0))
+
+    def test_get_frustrum_surface_degenerate_axes(self):
+        """Test that axes (anti)parallel to x do not produce NaNs"""
+        for p2 in ((10.0, 0.0, 0.0), (-10.0, 0.0, 0.0), (10.0, 0.01, 0.0)):
+            surfaces = get_frustrum_surface(
+                0.0, 0.0, 0.0, 1.0, p2[0], p2[1], p2[2], 1.0
+            )
+            for grid in surfaces[0]:
+                self.assertTrue(numpy.isfinite(grid).all())
+
+    def test_decimate_collinear_segments(self):
+        """Test decimate_collinear_segments"""
+        # three collinear segments along x, then a perpendicular one
+        seg_arr = numpy.array(
+            [
+                [0, 0, 0, 1, 1, 0, 0, 1],
+                [1, 0, 0, 1, 2, 0, 0, 1],
+                [2, 0, 0, 1, 3, 0, 0, 2],
+                [3, 0, 0, 2, 3, 5, 0, 2],
+            ],
+            dtype=numpy.float32,
+        )
+        merged = decimate_collinear_segments(seg_arr, tolerance=0.5)
+        self.assertEqual(merged.shape, (2, 8))
+        # merged run keeps first proximal and last distal (incl. diameter)
+        self.assertTrue(numpy.allclose(merged[0], [0, 0, 0, 1, 3, 0, 0, 2]))
+        self.assertTrue(numpy.allclose(merged[1], seg_arr[3]))
+        # a kink larger than the tolerance is not merged away
+        bent = seg_arr.copy()
+        bent[1, 4:7] = [2, 1, 0]
+        bent[2, 0:3] = [2, 1, 0]
+        self.assertEqual(len(decimate_collinear_segments(bent, 0.5)), 3)
+        # disabled by default
+        self.assertEqual(len(decimate_collinear_segments(seg_arr, 0)), 4)